@@ -0,0 +1,52 @@
+"""
+Compare batch_process_data against a loop of single process_data calls, both
+through the Python API and through the HTTP routes (Flask test client).
+
+    python -m benchmarks.bench_batch [num_regions] [num_years]
+"""
+import logging
+import sys
+
+import numpy as np
+
+from benchmarks.common import measure, print_table
+from utils.data_processor import batch_process_data, process_data
+
+def _regions(num_regions, num_years, seed=0):
+    rng = np.random.default_rng(seed)
+    regions = {}
+    for index in range(num_regions):
+        years = range(1950, 1950 + num_years)
+        trend = rng.normal(0.02, 0.01)
+        regions[f'region-{index}'] = {
+            'temperatureData': [{'year': year, 'temperature': 14 + trend * i + float(rng.normal(0, 0.1))}
+                                for i, year in enumerate(years)],
+            'economicData': [{'year': year, 'gdp': 100.0 + i} for i, year in enumerate(years)]
+        }
+    return regions
+
+def main(num_regions=200, num_years=70):
+    logging.disable(logging.INFO)
+    from main import app
+    client = app.test_client()
+    regions = _regions(num_regions, num_years)
+
+    # The uncached functions, so repeated runs measure the computation
+    python_loop = measure(lambda: [process_data.uncached(data, seed=1) for data in regions.values()])
+    python_batch = measure(lambda: batch_process_data.uncached(regions, seed=1))
+    # The HTTP path goes through the result cache, so vary the seed to force real work
+    seeds = iter(range(10**6))
+    http_loop = measure(lambda: [client.post('/api/process_data', json={**data, 'seed': next(seeds)})
+                                 for data in regions.values()], repeat=1)
+    http_batch = measure(lambda: client.post('/api/batch_process', json={'regions': regions, 'seed': next(seeds)}),
+                         repeat=1)
+
+    rows = []
+    for name, loop, batch in (('python', python_loop, python_batch), ('http', http_loop, http_batch)):
+        rows.append((name, f"{loop['median'] * 1000:.0f}", f"{batch['median'] * 1000:.0f}",
+                     f"{loop['median'] / batch['median']:.1f}x"))
+    print(f'{num_regions} regions x {num_years} years, 1000 simulations, 30-year horizon')
+    print_table(('path', 'loop_ms', 'batch_ms', 'speedup'), rows)
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
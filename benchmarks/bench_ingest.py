@@ -0,0 +1,59 @@
+"""
+Measure dataset ingestion throughput (parse, validate, sort, dedupe) for CSV and
+NDJSON uploads, and the cost of storing and reloading the ingested dataset.
+
+    python -m benchmarks.bench_ingest [num_rows]
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import measure, print_table
+from utils.datasets import DatasetStore, ingest_stream
+
+def _rows(num_rows, num_regions=100, seed=0):
+    # Station-style data: shuffled rows over many regions with ~5% repeated years
+    rng = np.random.default_rng(seed)
+    regions = rng.integers(0, num_regions, num_rows)
+    years = rng.integers(1850, 1850 + max(num_rows // num_regions, 1), num_rows)
+    temperatures = 14 + rng.normal(0, 0.5, num_rows)
+    gdps = 100 + rng.normal(0, 5, num_rows)
+    return [{'region': f'station-{region}', 'year': int(year), 'temperature': round(float(temperature), 3),
+             'gdp': round(float(gdp), 2)}
+            for region, year, temperature, gdp in zip(regions, years, temperatures, gdps)]
+
+def _csv(rows):
+    lines = ['region,year,temperature,gdp']
+    lines += [f"{row['region']},{row['year']},{row['temperature']},{row['gdp']}" for row in rows]
+    return ('\n'.join(lines) + '\n').encode('utf-8')
+
+def _ndjson(rows):
+    return ''.join(json.dumps(row) + '\n' for row in rows).encode('utf-8')
+
+def main(num_rows=200_000):
+    rows = _rows(num_rows)
+    results = []
+    dataset = None
+    for format_type, body in (('csv', _csv(rows)), ('ndjson', _ndjson(rows))):
+        timing = measure(lambda: ingest_stream(io.BytesIO(body), format_type), repeat=3)
+        dataset, report = ingest_stream(io.BytesIO(body), format_type)
+        results.append((format_type, f'{len(body) / 1e6:.1f}', f"{timing['median'] * 1000:.0f}",
+                        f"{num_rows / timing['median']:,.0f}", report['rows'], report['duplicates']))
+    print(f'Ingestion, {num_rows:,} rows over {len(dataset.regions)} regions')
+    print_table(('format', 'MB', 'median_ms', 'rows/s', 'kept', 'duplicates'), results)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = DatasetStore(os.path.join(directory, 'datasets.db'), cache_size=0)
+        save = measure(lambda: store.save(dataset), repeat=3)
+        load = measure(lambda: store.load(dataset.id), repeat=3)
+        size = os.path.getsize(store.store.path)
+    print()
+    print_table(('store', 'median_ms', 'file_bytes'),
+                [('save', f"{save['median'] * 1000:.1f}", size), ('load', f"{load['median'] * 1000:.1f}", '-')])
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,31 @@
+"""
+Benchmark streaming Monte Carlo risk metrics across process-pool sizes.
+
+    python -m benchmarks.bench_monte_carlo [num_simulations]
+"""
+import sys
+
+from benchmarks.common import measure, print_table
+from utils.data_processor import streaming_risk_metrics
+
+WORKER_COUNTS = (1, 2, 4, 8)
+
+def main(num_simulations=4_000_000, seed=42):
+    rows = []
+    reference = None
+    baseline = None
+    for workers in WORKER_COUNTS:
+        def run():
+            return streaming_risk_metrics(num_simulations, 15.0, 0.1, seed=seed, workers=workers)
+        metrics = run()
+        if reference is None:
+            reference = metrics
+        timing = measure(run, repeat=3)
+        baseline = baseline or timing['best']
+        rows.append((workers, f"{timing['best']:.3f}", f"{baseline / timing['best']:.2f}x",
+                     'yes' if metrics == reference else 'NO'))
+    print(f"streaming_risk_metrics, {num_simulations:,} paths")
+    print_table(('workers', 'best_s', 'speedup', 'identical'), rows)
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,46 @@
+"""
+Compare save/load throughput of the ReplitDB SQLite backend with the in-memory dict backend.
+
+    python -m benchmarks.bench_replit_db [num_sessions]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table
+from utils.data_processor import process_data
+from utils.replit_db import ReplitDB
+
+def _throughput(db, payload, num_sessions, bulk=False):
+    start = time.perf_counter()
+    if bulk:
+        session_ids = db.save_sessions([payload] * num_sessions)
+    else:
+        session_ids = [db.save_session(payload) for _ in range(num_sessions)]
+    save_rate = num_sessions / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for session_id in session_ids:
+        db.load_session(session_id)
+    load_rate = num_sessions / (time.perf_counter() - start)
+    return save_rate, load_rate
+
+def main(num_sessions=5000):
+    payload = process_data({}, seed=0)
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        backends = [
+            ('memory (dict)', ReplitDB(backend='memory'), False),
+            ('sqlite, save_session', ReplitDB(backend='sqlite', path=os.path.join(directory, 'single.db')), False),
+            ('sqlite, save_sessions', ReplitDB(backend='sqlite', path=os.path.join(directory, 'bulk.db')), True),
+        ]
+        for name, db, bulk in backends:
+            save_rate, load_rate = _throughput(db, payload, num_sessions, bulk)
+            size = os.path.getsize(db.store.path) if db.backend == 'sqlite' else '-'
+            rows.append((name, f'{save_rate:,.0f}', f'{load_rate:,.0f}', size))
+    print(f'ReplitDB throughput, {num_sessions:,} sessions (ops/s)')
+    print_table(('backend', 'save/s', 'load/s', 'file_bytes'), rows)
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:2]))
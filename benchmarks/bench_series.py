@@ -0,0 +1,63 @@
+"""
+Compare the columnar Series representation with lists of {'year', 'temperature'}
+dicts: memory held per series and latency of the trend + scenario stages.
+
+    python -m benchmarks.bench_series
+"""
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.common import measure, print_table
+from utils.data_processor import LinearTrend, evaluate_scenarios, default_scenario_specs
+from utils.series import Series
+
+SIZES = (1_000, 100_000, 1_000_000)
+
+def _peak_bytes(build):
+    tracemalloc.start()
+    value = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del value
+    return peak
+
+def _records_stages(records):
+    # The dict-list path: unpack columns per stage and build dicts for every point
+    years = [entry['year'] for entry in records]
+    temperatures = [entry['temperature'] for entry in records]
+    LinearTrend().fit(years, temperatures)
+    return {
+        spec['name']: [{'year': year, 'temperature': temp + spec['modifier'] * (i / len(years))}
+                       for i, (year, temp) in enumerate(zip(years, temperatures))]
+        for spec in default_scenario_specs()
+    }
+
+def _series_stages(series):
+    LinearTrend().fit(series.years, series.values)
+    return evaluate_scenarios(series, default_scenario_specs())
+
+def main():
+    rows = []
+    for size in SIZES:
+        years = np.arange(size) + 1
+        values = 14.0 + np.random.default_rng(0).normal(0, 0.1, size)
+        year_list, value_list = years.tolist(), values.tolist()
+
+        records_bytes = _peak_bytes(lambda: [{'year': y, 'temperature': v} for y, v in zip(year_list, value_list)])
+        series_bytes = _peak_bytes(lambda: Series(years.copy(), values.copy()))
+
+        records = [{'year': y, 'temperature': v} for y, v in zip(year_list, value_list)]
+        series = Series(years, values)
+        repeat = 5 if size < 1_000_000 else 2
+        records_time = measure(lambda: _records_stages(records), repeat=repeat)['best']
+        series_time = measure(lambda: _series_stages(series), repeat=repeat)['best']
+        convert_time = measure(lambda: Series.from_records(records), repeat=repeat)['best']
+
+        rows.append((f'{size:,}', f'{records_bytes / 1e6:.1f}', f'{series_bytes / 1e6:.2f}',
+                     f'{records_time * 1000:.1f}', f'{series_time * 1000:.1f}', f'{convert_time * 1000:.1f}'))
+    print('Series vs list-of-dicts (MB held, ms for trend fit + 2 scenarios, ms to convert records)')
+    print_table(('points', 'dicts_MB', 'series_MB', 'dicts_ms', 'series_ms', 'from_records_ms'), rows)
+
+if __name__ == '__main__':
+    main()
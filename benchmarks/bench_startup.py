@@ -0,0 +1,54 @@
+"""
+Measure how long a fresh interpreter takes to import main, with and without the
+startup warm-up, and list the slowest imports.
+
+    python -m benchmarks.bench_startup [repeat]
+"""
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.common import print_table
+
+def _run(code, env, extra_args=()):
+    start = time.perf_counter()
+    completed = subprocess.run([sys.executable, *extra_args, '-c', code], env=env, capture_output=True, text=True,
+                               check=True)
+    return time.perf_counter() - start, completed.stderr
+
+def _slowest_imports(stderr, count=10):
+    # -X importtime lines: "import time: self [us] | cumulative | module" (nesting by indentation)
+    top_level = []
+    for line in stderr.splitlines():
+        match = re.match(r'import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)', line)
+        if match and len(match.group(3)) <= 2:
+            top_level.append((int(match.group(2)), match.group(4)))
+    return sorted(top_level, reverse=True)[:count]
+
+def main(repeat=5):
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, LLM_BACKEND='simulator')
+        for variable, filename in (('REPLIT_DB_PATH', 'replit.db'), ('DATASET_DB_PATH', 'datasets.db'),
+                                   ('REPORT_DB_PATH', 'reports.db')):
+            env[variable] = os.path.join(directory, filename)
+
+        rows = []
+        baseline = statistics.median(_run('pass', env)[0] for _ in range(repeat))
+        rows.append(('python (no imports)', f'{baseline * 1000:.0f}'))
+        for label, warm_up in (('import main, WARM_UP=0', '0'), ('import main, warm-up', '1')):
+            timings = [_run('import main', dict(env, WARM_UP=warm_up))[0] for _ in range(repeat)]
+            rows.append((label, f'{statistics.median(timings) * 1000:.0f}'))
+        print(f'Median of {repeat} fresh interpreters')
+        print_table(('startup', 'ms'), rows)
+
+        _, stderr = _run('import main', dict(env, WARM_UP='0'), ('-X', 'importtime'))
+        print('\nSlowest top-level imports')
+        print_table(('module', 'cumulative_ms'),
+                    [(module, f'{micros / 1000:.1f}') for micros, module in _slowest_imports(stderr)])
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,60 @@
+import json
+import os
+import platform
+import statistics
+import time
+
+import numpy as np
+
+def measure(func, repeat=3, warmup=1):
+    """
+    Time func() and return a dict with the best and median wall-clock seconds.
+    """
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return {'best': min(timings), 'median': statistics.median(timings)}
+
+def print_table(headers, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    line = '  '.join(f'{{:>{width}}}' for width in widths)
+    print(line.format(*headers))
+    for row in rows:
+        print(line.format(*row))
+
+def latency_summary(latencies, wall_seconds):
+    """
+    p50/p95/p99/mean latency in milliseconds and throughput for a list of per-request seconds.
+    """
+    milliseconds = np.asarray(latencies) * 1000
+    p50, p95, p99 = np.percentile(milliseconds, [50, 95, 99])
+    return {
+        'requests': len(milliseconds),
+        'p50_ms': round(float(p50), 3),
+        'p95_ms': round(float(p95), 3),
+        'p99_ms': round(float(p99), 3),
+        'mean_ms': round(float(milliseconds.mean()), 3),
+        'throughput_rps': round(len(milliseconds) / wall_seconds, 1)
+    }
+
+def environment():
+    return {
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'cpus': os.cpu_count(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z')
+    }
+
+def write_results(path, suite, results, **meta):
+    """
+    Write {'suite', 'meta', 'results': {name: {metric: value}}}, the format
+    benchmarks.compare reads.
+    """
+    with open(path, 'w') as handle:
+        json.dump({'suite': suite, 'meta': {**environment(), **meta}, 'results': results}, handle, indent=2,
+                  sort_keys=True)
@@ -0,0 +1,71 @@
+"""
+Compare a benchmark run against a stored baseline (both written with --output).
+
+    python -m benchmarks.compare baseline.json current.json [--threshold 0.10]
+
+Latency metrics (*_s, *_ms) regress when they grow, throughput when it drops.
+Exits with status 1 if any metric regressed by more than the threshold.
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.common import print_table
+
+# The metrics judged for each suite; others are carried in the files but not compared
+COMPARED_METRICS = {
+    'micro': ('median_s',),
+    'load': ('p50_ms', 'p95_ms', 'p99_ms', 'throughput_rps'),
+}
+
+def _higher_is_better(metric):
+    return metric == 'throughput_rps'
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Return (rows, regressions) for the benchmarks present in both runs.
+    """
+    if baseline.get('suite') != current.get('suite'):
+        raise ValueError(f"Cannot compare a {baseline.get('suite')} run with a {current.get('suite')} run")
+    rows = []
+    regressions = []
+    for name in sorted(set(baseline['results']) & set(current['results'])):
+        for metric in COMPARED_METRICS[current['suite']]:
+            before = baseline['results'][name].get(metric)
+            after = current['results'][name].get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            worse = -change if _higher_is_better(metric) else change
+            status = 'REGRESSED' if worse > threshold else ('improved' if worse < -threshold else 'ok')
+            if status == 'REGRESSED':
+                regressions.append((name, metric, change))
+            rows.append((name, metric, f'{before:.4g}', f'{after:.4g}', f'{change:+.1%}', status))
+    return rows, regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('baseline')
+    parser.add_argument('current')
+    parser.add_argument('--threshold', type=float, default=0.10, help='allowed relative change (default 0.10)')
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as handle:
+        baseline = json.load(handle)
+    with open(args.current) as handle:
+        current = json.load(handle)
+    try:
+        rows, regressions = compare(baseline, current, args.threshold)
+    except ValueError as e:
+        sys.exit(str(e))
+    print_table(('benchmark', 'metric', 'baseline', 'current', 'change', 'status'), rows)
+    missing = sorted(set(baseline['results']) - set(current['results']))
+    if missing:
+        print(f"\nNot in the current run: {', '.join(missing)}")
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.threshold:.0%}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+In-process load generator: drives the API routes through the Flask test client
+from several threads and reports p50/p95/p99 latency and throughput per route.
+
+    python -m benchmarks.load [--requests N] [--concurrency C] [--routes a,b] [--cold] [--output load.json]
+
+Routes run one after another so their latencies do not mix. By default payloads
+repeat, which measures the cached hot path; --cold varies the seed of every
+pipeline request so each one computes. Storage goes to a temporary directory
+and the LLM routes use the offline simulator.
+"""
+import argparse
+import itertools
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import latency_summary, print_table, write_results
+
+def _series(num_years=40):
+    return {
+        'temperatureData': [{'year': 1990 + i, 'temperature': 14 + 0.02 * i} for i in range(num_years)],
+        'economicData': [{'year': 1990 + i, 'gdp': 100.0 + i} for i in range(num_years)]
+    }
+
+def build_routes(client, cold=False):
+    """
+    Return {name: (method, path, request kwargs factory)}. Routes that need an ID
+    (stored dataset, session, report) are prepared here with one request each.
+    """
+    data = _series()
+    seeds = itertools.count()
+    lock = threading.Lock()
+
+    def seed():
+        if not cold:
+            return 1
+        with lock:
+            return next(seeds)
+
+    def pipeline_body(**extra):
+        return lambda: {'json': {**data, 'seed': seed(), **extra}}
+
+    csv_body = 'year,temperature,gdp\n' + ''.join(f'{1990 + i},{14 + 0.02 * i},{100 + i}\n' for i in range(40))
+    dataset_id = client.post('/api/datasets?format=csv', data=csv_body.encode()).get_json()['datasetId']
+    session_id = client.post('/api/save_session', json=data).get_json()['session_id']
+    report_id = client.post('/api/reports', json={**data, 'seed': 1}).get_json()['jobId']
+    client.post('/generate_report', json={**data, 'seed': 1})
+    regions = {f'region-{index}': data for index in range(20)}
+    scenarios = client.post('/api/batch_scenarios', json={**data, 'scenarios': [
+        {'name': 'low', 'modifier': -1.0}, {'name': 'high', 'modifier': 1.0}]}).get_json()
+    static = lambda **kwargs: (lambda: kwargs)
+    default_etag = client.get('/api/get_default_data').headers['ETag']
+
+    return {
+        'landing': ('GET', '/', static()),
+        'dashboard': ('GET', '/dashboard', static()),
+        'about': ('GET', '/about', static()),
+        'get_default_data': ('GET', '/api/get_default_data', static()),
+        'get_default_data_304': ('GET', '/api/get_default_data', static(headers={'If-None-Match': default_etag})),
+        'process_data': ('POST', '/api/process_data', pipeline_body()),
+        'process_data_dataset': ('POST', '/api/process_data', lambda: {'json': {'datasetId': dataset_id,
+                                                                                 'seed': seed()}}),
+        'process_data_incremental': ('POST', '/api/process_data', pipeline_body(incremental=True,
+                                                                                datasetKey='load')),
+        'advanced_analytics': ('POST', '/api/advanced_analytics', pipeline_body()),
+        'batch_process': ('POST', '/api/batch_process', lambda: {'json': {'regions': regions, 'seed': seed()}}),
+        'generate_report': ('POST', '/generate_report', pipeline_body()),
+        'get_report': ('GET', f'/reports/{report_id}', static()),
+        'report_status': ('GET', f'/api/reports/{report_id}', static()),
+        'ingest_dataset': ('POST', '/api/datasets?format=csv', static(data=csv_body.encode())),
+        'get_dataset': ('GET', f'/api/datasets/{dataset_id}', static()),
+        'export_data': ('POST', '/api/export_data', static(json={'data': data['temperatureData'],
+                                                                  'format': 'csv'})),
+        'export_data_stream': ('POST', '/api/export_data/stream', static(json={'data': data['temperatureData'],
+                                                                                'format': 'csv', 'gzip': True})),
+        'update_scenario': ('POST', '/api/update_scenario', static(json={**data, 'scenario': 'optimistic'})),
+        'batch_scenarios': ('POST', '/api/batch_scenarios', static(json={**data, 'scenarios': [
+            {'name': f'scenario-{index}', 'modifier': index / 10} for index in range(50)]})),
+        'update_sensitivity': ('POST', '/api/update_sensitivity', static(json={'sensitivity': 70,
+                                                                               'economicData': data['economicData']})),
+        'sensitivity_sweep': ('POST', '/api/sensitivity_sweep', static(json={'economicData': data['economicData'],
+                                                                             'scenarios': True})),
+        'generate_summary': ('POST', '/api/generate_summary', static(json=data)),
+        'compare_scenarios': ('POST', '/api/compare_scenarios', static(json={'scenarios': scenarios})),
+        'llm_query': ('POST', '/api/llm_query', static(json={'query': 'What drives the temperature trend?'})),
+        'llm_query_stream': ('POST', '/api/llm_query/stream', static(json={'query': 'Summarize the risk.'})),
+        'save_session': ('POST', '/api/save_session', static(json=data)),
+        'load_session': ('GET', f'/api/load_session/{session_id}', static()),
+        'cache_stats': ('GET', '/api/cache_stats', static()),
+        'metrics': ('GET', '/metrics', static()),
+    }
+
+def run_route(app, method, path, kwargs_factory, num_requests, concurrency):
+    """
+    Send num_requests requests from `concurrency` threads (one test client each).
+    Returns (latencies, error count, wall seconds).
+    """
+    local = threading.local()
+
+    def one(_):
+        client = getattr(local, 'client', None)
+        if client is None:
+            client = local.client = app.test_client()
+        kwargs = kwargs_factory()
+        start = time.perf_counter()
+        response = client.open(path, method=method, **kwargs)
+        response.get_data()
+        elapsed = time.perf_counter() - start
+        return elapsed, response.status_code >= 400
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        outcomes = list(executor.map(one, range(num_requests)))
+    wall = time.perf_counter() - start
+    return [elapsed for elapsed, _ in outcomes], sum(failed for _, failed in outcomes), wall
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200, help='requests per route')
+    parser.add_argument('--concurrency', type=int, default=4)
+    parser.add_argument('--routes', help='comma-separated route names (default: all)')
+    parser.add_argument('--cold', action='store_true', help='vary the seed so pipeline routes miss the cache')
+    parser.add_argument('--output', help='write machine-readable results to this JSON file')
+    args = parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp(prefix='climate-load-')
+    os.environ.setdefault('LLM_BACKEND', 'simulator')
+    for variable, filename in (('REPLIT_DB_PATH', 'replit.db'), ('DATASET_DB_PATH', 'datasets.db'),
+                               ('REPORT_DB_PATH', 'reports.db')):
+        os.environ.setdefault(variable, os.path.join(directory, filename))
+    from main import app
+    logging.disable(logging.INFO)
+
+    routes = build_routes(app.test_client(), cold=args.cold)
+    selected = args.routes.split(',') if args.routes else list(routes)
+    unknown = [name for name in selected if name not in routes]
+    if unknown:
+        sys.exit(f"Unknown routes: {', '.join(unknown)}. Available: {', '.join(routes)}")
+
+    results = {}
+    rows = []
+    for name in selected:
+        method, path, kwargs_factory = routes[name]
+        latencies, errors, wall = run_route(app, method, path, kwargs_factory, args.requests, args.concurrency)
+        summary = {**latency_summary(latencies, wall), 'errors': errors}
+        results[name] = summary
+        rows.append((name, summary['p50_ms'], summary['p95_ms'], summary['p99_ms'], summary['throughput_rps'],
+                     errors))
+    print(f"{args.requests} requests per route, concurrency {args.concurrency}"
+          f"{', cold cache' if args.cold else ''}")
+    print_table(('route', 'p50_ms', 'p95_ms', 'p99_ms', 'req/s', 'errors'), rows)
+    if args.output:
+        write_results(args.output, 'load', results, requests=args.requests, concurrency=args.concurrency,
+                      cold=args.cold)
+        print(f'\nWrote {args.output}')
+    shutil.rmtree(directory, ignore_errors=True)
+
+if __name__ == '__main__':
+    main()
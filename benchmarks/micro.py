@@ -0,0 +1,98 @@
+"""
+Micro-benchmarks for the analytics pipeline and storage over a range of input sizes.
+
+    python -m benchmarks.micro [--quick] [--repeat N] [--output micro.json]
+
+Results are keyed '<benchmark>[<size>]' with best/median seconds; compare two
+runs with `python -m benchmarks.compare baseline.json micro.json`.
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+from benchmarks.common import measure, print_table, write_results
+from utils.data_processor import export_data, generate_scenarios, monte_carlo_simulation, process_data
+from utils.replit_db import ReplitDB
+from utils.scenario_comparison import compare_scenarios
+
+SIZES = {
+    'process_data': (50, 500, 5000),
+    'monte_carlo_simulation': (1_000, 10_000, 100_000),
+    'generate_scenarios': (100, 1_000, 10_000),
+    'compare_scenarios': (100, 1_000, 10_000),
+    'export_data': (1_000, 10_000, 100_000),
+    'replit_db': (100, 1_000),
+}
+QUICK_SIZES = {name: sizes[:2] for name, sizes in SIZES.items()}
+
+def _series(num_years, seed=0):
+    rng = np.random.default_rng(seed)
+    years = range(2100 - num_years, 2100)
+    temperatures = 14 + 0.02 * np.arange(num_years) + rng.normal(0, 0.1, num_years)
+    return {
+        'temperatureData': [{'year': year, 'temperature': float(value)} for year, value in zip(years, temperatures)],
+        'economicData': [{'year': year, 'gdp': 100.0 + i} for i, year in enumerate(years)]
+    }
+
+def _replit_db_roundtrip(backend, directory, num_sessions, payload):
+    path = os.path.join(directory, f'{backend}-{num_sessions}.db') if backend == 'sqlite' else None
+    db = ReplitDB(backend=backend, path=path)
+
+    def run():
+        ids = [db.save_session(payload) for _ in range(num_sessions)]
+        for session_id in ids:
+            db.load_session(session_id)
+    return run
+
+def cases(sizes, directory):
+    """
+    Yield (benchmark, size label, callable). Cached functions are called through
+    .uncached so every run measures the computation.
+    """
+    for years in sizes['process_data']:
+        data = _series(years)
+        yield 'process_data', f'years={years}', lambda data=data: process_data.uncached(data, seed=1)
+    for paths in sizes['monte_carlo_simulation']:
+        yield 'monte_carlo_simulation', f'paths={paths}', \
+            lambda paths=paths: monte_carlo_simulation(paths, 15.0, 0.1, horizon=30, seed=1)
+    for years in sizes['generate_scenarios']:
+        data = _series(years)
+        yield 'generate_scenarios', f'years={years}', lambda data=data: generate_scenarios.uncached(data, 'all')
+    for years in sizes['compare_scenarios']:
+        scenarios = generate_scenarios.uncached(_series(years), 'all')
+        yield 'compare_scenarios', f'years={years}', lambda scenarios=scenarios: compare_scenarios(scenarios)
+    for rows in sizes['export_data']:
+        records = _series(rows)['temperatureData']
+        for format_type in ('csv', 'json'):
+            yield f'export_data_{format_type}', f'rows={rows}', \
+                lambda records=records, format_type=format_type: export_data(records, format_type)
+    payload = process_data.uncached(_series(50), seed=1)
+    for num_sessions in sizes['replit_db']:
+        for backend in ('memory', 'sqlite'):
+            yield f'replit_db_{backend}', f'sessions={num_sessions}', \
+                _replit_db_roundtrip(backend, directory, num_sessions, payload)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--quick', action='store_true', help='only the two smallest sizes of each benchmark')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--output', help='write machine-readable results to this JSON file')
+    args = parser.parse_args(argv)
+
+    results = {}
+    rows = []
+    with tempfile.TemporaryDirectory() as directory:
+        for benchmark, size, func in cases(QUICK_SIZES if args.quick else SIZES, directory):
+            timing = measure(func, repeat=args.repeat)
+            name = f'{benchmark}[{size}]'
+            results[name] = {'best_s': timing['best'], 'median_s': timing['median']}
+            rows.append((benchmark, size, f"{timing['best'] * 1000:.3f}", f"{timing['median'] * 1000:.3f}"))
+    print_table(('benchmark', 'size', 'best_ms', 'median_ms'), rows)
+    if args.output:
+        write_results(args.output, 'micro', results, repeat=args.repeat, quick=args.quick)
+        print(f'\nWrote {args.output}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""
+Gunicorn settings for running several workers:
+
+    gunicorn -c gunicorn.conf.py main:app
+
+The app is preloaded, so importing main and its warm-up (see utils.warmup)
+happen once in the master and every worker forks ready to serve.
+"""
+import gc
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 5000)}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+preload_app = os.environ.get('PRELOAD_APP', '1') != '0'
+
+# This file is read in the master before the app is imported, so these defaults
+# reach every worker. Per-process state must not back anything a later request
+# may land on another worker for: sessions go to the shared SQLite file, and all
+# workers sign session cookies with the same key.
+if workers > 1:
+    os.environ.setdefault('SESSION_BACKEND', 'sqlite')
+os.environ.setdefault('SECRET_KEY', os.urandom(24).hex())
+
+def when_ready(server):
+    # Runs in the master before the first fork. Objects from import and warm-up
+    # live as long as the process; freezing them keeps the workers' garbage
+    # collections from writing to (and so copying) the pages they share.
+    gc.freeze()
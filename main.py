@@ -1,23 +1,63 @@
 # Import necessary modules and custom utilities
-from flask import Flask, render_template, request, jsonify, session
-from utils.data_processor import process_data, export_data, generate_scenarios, perform_sensitivity_analysis, load_default_data
-from utils.llm_integration import get_llm_response
+from flask import Flask, render_template, request, jsonify, session, g, Response, stream_with_context, url_for
+from utils.data_processor import (export_data, generate_scenarios, perform_sensitivity_analysis,
+                                  evaluate_scenarios, normalize_scenario_specs,
+                                  batch_process_data, sensitivity_sweep, sensitivity_grid, default_scenario_specs,
+                                  load_default_data, RESULT_CACHE)
+from utils.pipeline import run_pipeline, get_simulation_params, PIPELINE_FLIGHTS
+from utils.exporter import iter_export, EXPORT_FORMATS
+from utils.datasets import create_dataset_store, ingest_stream, INGEST_FORMATS
+from utils.default_bundle import get_default_bundle
+from utils.report_jobs import create_report_queue
+from utils.warmup import warm_up, WARM_UP
+from utils.cache import canonical_hash
+from utils.llm_integration import get_llm_response, stream_llm_response, LLMBusyError, RESPONSE_CACHE as LLM_RESPONSE_CACHE
 from utils.replit_db import ReplitDB
-import json
+from utils.session_store import ServerSideSessionInterface, create_session_store
+from utils.llm_context import build_context
+from utils.log_utils import LazySummary, LazyJSON
+from utils.metrics import REGISTRY, METRICS_ENABLED, observe_request
 import os
+import json
 import logging
+import time
 import traceback
 from datetime import datetime
 from typing import Dict, Any, Optional
 
 # Initialize Flask app and set up session management
 app = Flask(__name__)
-app.secret_key = os.urandom(24)  # Generate a random secret key for secure sessions
-db = ReplitDB()
+# Use a shared SECRET_KEY when running several workers; otherwise generate a random one
+app.secret_key = os.environ.get('SECRET_KEY') or os.urandom(24)
+# Keep session payloads server-side; the cookie only carries a signed session ID
+app.session_interface = ServerSideSessionInterface(create_session_store(app.instance_path))
+db = ReplitDB(path=os.environ.get('REPLIT_DB_PATH', os.path.join(app.instance_path, 'replit_db.sqlite3')))
+datasets = create_dataset_store(app.instance_path)
+reports = create_report_queue(app.instance_path)
 
 # Configure logging for better debugging and monitoring
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+# Per-request timing and payload size, logged for every route
+@app.before_request
+def start_request_timer():
+    g.request_start = time.perf_counter()
+
+@app.after_request
+def log_request_timing(response):
+    start = g.pop('request_start', None)
+    if start is not None:
+        elapsed = time.perf_counter() - start
+        # Label by URL rule rather than raw path to keep the series count bounded
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        observe_request(route, request.method, elapsed)
+        elapsed_ms = elapsed * 1000
+        response_size = response.content_length if not response.is_streamed else None
+        logging.info('%s %s -> %s in %.1f ms (request %s B, response %s B)', request.method, request.path,
+                     response.status_code, elapsed_ms, request.content_length or 0,
+                     '-' if response_size is None else response_size)
+    return response
+
 # Route for the landing page
 @app.route('/')
 def landing():
@@ -27,54 +67,157 @@ def landing():
 @app.route('/dashboard')
 def dashboard():
     logging.info('Dashboard route accessed')
-    # Load default data if not present in the session
-    if 'data' not in session:
-        logging.info('Loading default data into session')
-        session['data'] = load_default_data()
-    else:
-        logging.info('Using existing data from session')
-    
-    logging.info(f'Session data: {json.dumps(session["data"], indent=2)}')
-    
     current_year = datetime.now().year
     return render_template('index.html', current_year=current_year)
 
-# API route to get default data
+# API route to get default data. Until the user processes their own data this is
+# the precomputed default bundle, served from pre-encoded bytes with a strong ETag
+# so repeat loads revalidate to a 304.
 @app.route('/api/get_default_data', methods=['GET'])
 def api_get_default_data():
-    logging.info('Default data requested')
-    if 'data' not in session:
-        logging.info('Loading default data into session')
-        session['data'] = load_default_data()
-    data = session['data']
-    logging.info(f'Returning default data: {json.dumps(data, indent=2)}')
-    # Return a structured response with all required data fields
-    return jsonify({
-        'temperatureData': data.get('temperatureData', []),
-        'economicData': data.get('economicData', []),
-        'riskMetrics': data.get('riskMetrics', {}),
-        'scenarioData': data.get('scenarioData', {}),
-        'sensitivityData': data.get('sensitivityData', {})
-    })
+    if 'data' in session:
+        data = session['data']
+        logging.info('Returning session data: %s', LazySummary(data))
+        logging.debug('Session data payload: %s', LazyJSON(data))
+        response = jsonify({
+            'temperatureData': data.get('temperatureData', []),
+            'economicData': data.get('economicData', []),
+            'riskMetrics': data.get('riskMetrics', {}),
+            'scenarioData': data.get('scenarioData', {}),
+            'sensitivityData': data.get('sensitivityData', {})
+        })
+        response.headers['Cache-Control'] = 'no-store'
+        return response
+
+    bundle = get_default_bundle()
+    use_gzip = 'gzip' in request.accept_encodings
+    etag = bundle.gzip_etag if use_gzip else bundle.etag
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+    elif use_gzip:
+        response = Response(bundle.gzip_body, mimetype='application/json')
+        response.headers['Content-Encoding'] = 'gzip'
+    else:
+        response = Response(bundle.body, mimetype='application/json')
+    response.set_etag(etag)
+    # The URL serves session data once the user has some, so caches must revalidate
+    response.headers['Cache-Control'] = 'private, no-cache'
+    response.vary.update(('Cookie', 'Accept-Encoding'))
+    return response
+
+def pipeline_input(data):
+    """
+    Swap a {'datasetId': ..., 'region': ...} reference for the stored series, so
+    large ingested datasets are not re-posted with every pipeline call. A body
+    with only parameters ({'seed': 1}) runs on the session's series, else the
+    defaults. Raises ValueError if the temperature series is empty.
+    """
+    dataset_id = data.get('datasetId')
+    if dataset_id:
+        dataset = datasets.load(dataset_id)
+        if dataset is None:
+            raise LookupError(f"Unknown dataset: {dataset_id}")
+        return {**data, **dataset.payload(data.get('region'))}
+    if 'temperatureData' not in data:
+        series = session.get('data') or load_default_data()
+        data = {**data, 'temperatureData': series.get('temperatureData', []),
+                'economicData': series.get('economicData', [])}
+    if not data['temperatureData']:
+        raise ValueError("temperatureData must not be empty")
+    return data
+
+# API route to ingest a CSV or NDJSON upload as a stored dataset. The body is the
+# file itself (or a multipart 'file' field); ?format= and ?name= are optional.
+@app.route('/api/datasets', methods=['POST'])
+def api_ingest_dataset():
+    # Only multipart bodies may be parsed as a form: touching request.files or
+    # request.form also parses (and consumes) a urlencoded body, which is what
+    # curl --data-binary @file.csv sends by default
+    multipart = request.mimetype == 'multipart/form-data'
+    upload = request.files.get('file') if multipart else None
+    form = request.form if multipart else {}
+    stream = upload.stream if upload else request.stream
+    filename = upload.filename if upload else ''
+    format_type = request.args.get('format') or form.get('format')
+    if not format_type:
+        extension = os.path.splitext(filename or '')[1].lstrip('.').lower()
+        format_type = extension if extension in INGEST_FORMATS else (
+            'ndjson' if 'ndjson' in (request.mimetype or '') else 'csv')
+    if format_type not in INGEST_FORMATS:
+        return jsonify({'error': f'Unsupported format: {format_type}'}), 400
+
+    name = request.args.get('name') or form.get('name') or filename or None
+    try:
+        dataset, report = ingest_stream(stream, format_type, name)
+    except (UnicodeDecodeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    datasets.save(dataset)
+    logging.info('Ingested dataset %s: %s rows, %s duplicates, %s rejected', dataset.id, report['rows'],
+                 report['duplicates'], report['rejected'])
+    return jsonify({**dataset.summary(), **report}), 201
+
+# API route to describe a stored dataset
+@app.route('/api/datasets/<dataset_id>', methods=['GET'])
+def api_get_dataset(dataset_id):
+    dataset = datasets.load(dataset_id)
+    if dataset is None:
+        return jsonify({'error': 'Dataset not found'}), 404
+    return jsonify(dataset.summary())
 
 # API route to process data and generate scenarios and sensitivity analysis
 @app.route('/api/process_data', methods=['POST'])
 def api_process_data():
     data = request.json or session.get('data', {})
-    processed_data = process_data(data)
-    scenario_data = generate_scenarios(processed_data)
-    sensitivity_data = perform_sensitivity_analysis(processed_data)
-    
-    # Combine all results into a single response
-    result = {
-        **processed_data,
-        'scenarioData': scenario_data,
-        'sensitivityData': sensitivity_data
-    }
+    try:
+        params = get_simulation_params(data)
+        data = pipeline_input(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': e.args[0]}), 404
+    # Incremental mode patches the trend fit kept for this dataset (the client's
+    # datasetKey, else the session) instead of refitting the whole series
+    if data.get('incremental'):
+        dataset_key = data.get('datasetKey')
+        params['incremental_key'] = ('key', str(dataset_key)) if dataset_key else ('session', session.sid)
+    try:
+        result = run_pipeline(data, **params)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid data: {e}'}), 400
     
     session['data'] = result
     return jsonify(result)
 
+# API route to process many regions in one call: {'regions': {name: {'temperatureData',
+# 'economicData'}}} or {'datasetId': ...} for every region of an ingested dataset
+@app.route('/api/batch_process', methods=['POST'])
+def api_batch_process():
+    data = request.json
+    if not data:
+        return jsonify({'error': 'No data provided'}), 400
+    try:
+        params = get_simulation_params(data)
+        if params.pop('risk_mode') != 'exact':
+            raise ValueError("Batch processing only supports the exact risk mode")
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+
+    if data.get('datasetId'):
+        dataset = datasets.load(data['datasetId'])
+        if dataset is None:
+            return jsonify({'error': f"Unknown dataset: {data['datasetId']}"}), 404
+        regions = {name: dataset.payload(name) for name in dataset.regions}
+    else:
+        regions = data.get('regions')
+        if not isinstance(regions, dict) or not all(isinstance(region, dict) for region in regions.values()):
+            return jsonify({'error': "'regions' must map region names to series"}), 400
+    try:
+        result = batch_process_data(regions, **params)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid batch request: {e}'}), 400
+    logging.info('Batch processed %d regions', len(result))
+    return jsonify({'regions': result})
+
 # API route to export data in various formats
 @app.route('/api/export_data', methods=['POST'])
 def api_export_data():
@@ -92,6 +235,57 @@ def api_export_data():
         logging.error(f"Error exporting data: {str(e)}")
         return jsonify({'error': 'An error occurred while exporting data'}), 500
 
+# API route to download an export as a chunked stream instead of one JSON string.
+# POST {'data', 'format', 'gzip'} exports the given records; GET exports a series
+# of the session data (?series=temperatureData&format=csv&gzip=1).
+@app.route('/api/export_data/stream', methods=['GET', 'POST'])
+def api_export_data_stream():
+    if request.method == 'POST':
+        options = request.json or {}
+        data = options.get('data')
+    else:
+        options = request.args
+        series = options.get('series')
+        data = session.get('data', {}).get(series) if series else session.get('data')
+    if data is None:
+        return jsonify({'error': 'No data provided'}), 400
+
+    format_type = options.get('format', 'csv')
+    compress = str(options.get('gzip', '')).lower() in ('1', 'true', 'yes')
+    if format_type not in EXPORT_FORMATS:
+        return jsonify({'error': f'Unsupported format: {format_type}'}), 400
+    mimetype, extension = EXPORT_FORMATS[format_type]
+
+    # Pull the first chunk here so bad input is a 400 rather than a broken download
+    chunks = iter_export(data, format_type, compress)
+    try:
+        first = next(chunks, None)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    def generate():
+        if first is not None:
+            yield first
+        yield from chunks
+
+    filename = f"climate_data.{extension}"
+    if compress:
+        mimetype, filename = 'application/gzip', filename + '.gz'
+    return Response(stream_with_context(generate()), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename="{filename}"'})
+
+def llm_context():
+    """
+    Token-budgeted digest of the data the question is about: the request's
+    optional 'data' field, else the user's session data.
+    """
+    data = (request.json or {}).get('data') or session.get('data')
+    try:
+        return build_context(data)
+    except Exception as e:
+        logging.warning("Could not build LLM context: %s", e)
+        return ''
+
 # API route to handle LLM queries
 @app.route('/api/llm_query', methods=['POST'])
 def api_llm_query():
@@ -100,12 +294,41 @@ def api_llm_query():
         return jsonify({'error': 'No query provided'}), 400
     
     try:
-        response = get_llm_response(query)
+        response = get_llm_response(query, llm_context())
         return jsonify({'response': response})
+    except LLMBusyError:
+        return jsonify({'error': 'The assistant is busy. Please try again shortly.'}), 503
     except Exception as e:
         logging.error(f"Error in LLM query: {str(e)}")
         return jsonify({'error': 'An error occurred while processing your query.'}), 500
 
+def _sse_event(payload, event=None):
+    prefix = f"event: {event}\n" if event else ''
+    return f"{prefix}data: {json.dumps(payload)}\n\n"
+
+# API route streaming LLM tokens as server-sent events
+@app.route('/api/llm_query/stream', methods=['POST'])
+def api_llm_query_stream():
+    query = request.json.get('query') if request.json else None
+    if not query:
+        return jsonify({'error': 'No query provided'}), 400
+
+    context = llm_context()
+
+    def generate():
+        try:
+            for chunk in stream_llm_response(query, context):
+                yield _sse_event({'token': chunk})
+            yield _sse_event({}, event='done')
+        except LLMBusyError:
+            yield _sse_event({'error': 'The assistant is busy. Please try again shortly.'}, event='error')
+        except Exception as e:
+            logging.error("Error in streaming LLM query: %s", e)
+            yield _sse_event({'error': 'An error occurred while processing your query.'}, event='error')
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 # API route to save session data
 @app.route('/api/save_session', methods=['POST'])
 def api_save_session():
@@ -124,36 +347,100 @@ def api_load_session(session_id):
         return jsonify({'error': 'Session not found'}), 404
     return jsonify(session_data)
 
-# Route to generate a report based on processed data
+def _render_report(data, params, current_year, base_url):
+    # Runs on a report worker thread, outside the request that queued it
+    report_data = run_pipeline(data, **params)
+    with app.test_request_context(base_url=base_url):
+        return render_template('report.html', report_data=report_data, current_year=current_year)
+
+def submit_report(data):
+    """
+    Queue a report for the request payload and return (job ID, status). The job
+    ID hashes the dataset, the simulation parameters and the report year.
+    """
+    params = get_simulation_params(data)
+    data = pipeline_input(data)
+    current_year = datetime.now().year
+    job_id = canonical_hash('report', data.get('temperatureData', []), data.get('economicData', []), params,
+                            current_year)[:32]
+    status = reports.submit(job_id, _render_report, data, params, current_year, request.url_root)
+    return job_id, status
+
+def _report_response(job_id, html):
+    response = Response(html, mimetype='text/html')
+    response.set_etag(job_id)
+    return response.make_conditional(request)
+
+def _job_links(job_id, status):
+    return {'jobId': job_id, 'status': status, 'statusUrl': url_for('api_report_status', job_id=job_id),
+            'reportUrl': url_for('get_report', job_id=job_id)}
+
+# Route to generate a report based on processed data. Reports render on the
+# background queue; this waits for the render (up to REPORT_WAIT_TIMEOUT) and
+# answers 202 with the job ID if it takes longer. Stored reports return at once.
 @app.route('/generate_report', methods=['POST'])
 def generate_report():
     data = request.json or session.get('data', {})
-    processed_data = process_data(data)
-    scenario_data = generate_scenarios(processed_data)
-    sensitivity_data = perform_sensitivity_analysis(processed_data)
-    
-    report_data = {
-        **processed_data,
-        'scenarioData': scenario_data,
-        'sensitivityData': sensitivity_data
-    }
-    
-    current_year = datetime.now().year
-    return render_template('report.html', report_data=report_data, current_year=current_year)
+    try:
+        job_id, status = submit_report(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': e.args[0]}), 404
+    html = reports.result(job_id) if status == 'done' else reports.wait(job_id)
+    if html is None:
+        state = reports.status(job_id)
+        if state['status'] == 'failed':
+            return jsonify({'error': 'Report rendering failed', **state}), 500
+        return jsonify(_job_links(job_id, state['status'])), 202
+    return _report_response(job_id, html)
+
+# API route to queue a report without waiting; poll statusUrl, then fetch reportUrl
+@app.route('/api/reports', methods=['POST'])
+def api_submit_report():
+    data = request.json or session.get('data', {})
+    try:
+        job_id, status = submit_report(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': e.args[0]}), 404
+    return jsonify(_job_links(job_id, status)), 200 if status == 'done' else 202
+
+# API route to poll a report job
+@app.route('/api/reports/<job_id>', methods=['GET'])
+def api_report_status(job_id):
+    state = reports.status(job_id)
+    return jsonify(state), 404 if state['status'] == 'unknown' else 200
+
+# Route serving a rendered report
+@app.route('/reports/<job_id>', methods=['GET'])
+def get_report(job_id):
+    html = reports.result(job_id)
+    if html is not None:
+        return _report_response(job_id, html)
+    state = reports.status(job_id)
+    if state['status'] == 'unknown':
+        return jsonify({'error': 'Report not found'}), 404
+    if state['status'] == 'failed':
+        return jsonify({'error': 'Report rendering failed', **state}), 500
+    return jsonify(_job_links(job_id, state['status'])), 202
 
 # API route for advanced analytics
 @app.route('/api/advanced_analytics', methods=['POST'])
 def api_advanced_analytics():
     data = request.json or session.get('data', {})
-    processed_data = process_data(data)
-    scenario_data = generate_scenarios(processed_data)
-    sensitivity_data = perform_sensitivity_analysis(processed_data)
-    
-    result = {
-        **processed_data,
-        'scenarioData': scenario_data,
-        'sensitivityData': sensitivity_data
-    }
+    try:
+        params = get_simulation_params(data)
+        data = pipeline_input(data)
+    except (TypeError, ValueError) as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': e.args[0]}), 404
+    try:
+        result = run_pipeline(data, **params)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid data: {e}'}), 400
     
     return jsonify(result)
 
@@ -162,7 +449,8 @@ def api_advanced_analytics():
 def api_update_scenario():
     try:
         data = request.json
-        logging.info(f"Received scenario update request: {json.dumps(data, indent=2)}")
+        logging.info('Received scenario update request: %s', LazySummary(data))
+        logging.debug('Scenario update payload: %s', LazyJSON(data))
 
         if not data:
             return jsonify({'error': 'No data provided in the request'}), 400
@@ -174,19 +462,41 @@ def api_update_scenario():
             return jsonify({'error': 'No temperature data provided'}), 400
 
         updated_scenario = generate_scenarios({'temperatureData': temperature_data}, scenario_type)
-        logging.info(f"Generated updated scenario: {json.dumps(updated_scenario, indent=2)}")
+        logging.info('Generated updated scenario: %s', LazySummary(updated_scenario))
         
         return jsonify(updated_scenario)
     except Exception as e:
         logging.error(f"Error updating scenario: {str(e)}")
         return jsonify({'error': 'An error occurred while updating the scenario'}), 500
 
+# API route to evaluate many custom scenarios in one call
+@app.route('/api/batch_scenarios', methods=['POST'])
+def api_batch_scenarios():
+    data = request.json
+    if not data:
+        return jsonify({'error': 'No data provided in the request'}), 400
+
+    temperature_data = data.get('temperatureData')
+    if not temperature_data:
+        return jsonify({'error': 'No temperature data provided'}), 400
+
+    try:
+        specs = normalize_scenario_specs(data.get('scenarios'))
+        scenarios = {name: series.to_records()
+                     for name, series in evaluate_scenarios(temperature_data, specs).items()}
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid scenario request: {e}'}), 400
+
+    logging.info('Evaluated %d scenarios over %d years', len(specs), len(temperature_data))
+    return jsonify(scenarios)
+
 # API route to update sensitivity analysis
 @app.route('/api/update_sensitivity', methods=['POST'])
 def api_update_sensitivity():
     try:
         data = request.json
-        logging.info(f"Received sensitivity update request: {json.dumps(data, indent=2)}")
+        logging.info('Received sensitivity update request: %s', LazySummary(data))
+        logging.debug('Sensitivity update payload: %s', LazyJSON(data))
 
         if not data:
             return jsonify({'error': 'No data provided in the request'}), 400
@@ -199,12 +509,11 @@ def api_update_sensitivity():
         if not economic_data:
             return jsonify({'error': 'Economic data is missing or empty'}), 400
 
-        logging.info(f"Performing sensitivity analysis. Sensitivity: {sensitivity_value}")
-        logging.info(f"Economic data structure: {json.dumps(economic_data, indent=2)}")
+        logging.info('Performing sensitivity analysis. Sensitivity: %s', sensitivity_value)
 
         updated_sensitivity = perform_sensitivity_analysis({'economicData': economic_data}, sensitivity_value)
         
-        logging.info(f"Sensitivity analysis completed. Result: {json.dumps(updated_sensitivity, indent=2)}")
+        logging.info('Sensitivity analysis completed. Result: %s', LazySummary(updated_sensitivity))
 
         if not all(isinstance(value, (int, float)) for value in updated_sensitivity.values()):
             return jsonify({'error': 'Invalid sensitivity values returned from analysis'}), 500
@@ -216,9 +525,34 @@ def api_update_sensitivity():
         logging.error(traceback.format_exc())
         return jsonify({'error': 'An unexpected error occurred', 'errorType': str(e.__class__.__name__)}), 500
 
+# API route for a whole sensitivity curve in one request: the grid is 'values', or
+# 'grid': {start, stop, step} (default 0-100 in steps of 1, the slider's range),
+# optionally crossed with 'scenarios' (true for the built-in ones, or a list of specs)
+@app.route('/api/sensitivity_sweep', methods=['POST'])
+def api_sensitivity_sweep():
+    data = request.json
+    if not data:
+        return jsonify({'error': 'No data provided in the request'}), 400
+    try:
+        if data.get('values') is not None:
+            if not isinstance(data['values'], list):
+                raise ValueError("values must be a list")
+            values = [float(value) for value in data['values']]
+        else:
+            grid = data.get('grid') or {}
+            values = sensitivity_grid(grid.get('start', 0), grid.get('stop', 100), grid.get('step', 1))
+        scenarios = data.get('scenarios')
+        specs = default_scenario_specs() if scenarios is True else (
+            normalize_scenario_specs(scenarios) if scenarios else None)
+        result = sensitivity_sweep(data.get('economicData') or [], values, specs)
+    except (KeyError, TypeError, ValueError) as e:
+        return jsonify({'error': f'Invalid sweep request: {e}'}), 400
+    logging.info('Sensitivity sweep: %d values x %d scenarios', len(result['values']), len(result['scenarios']))
+    return jsonify(result)
+
 # Import additional utilities for new features
 from utils.nlg import generate_chart_summary
-from utils.scenario_comparison import compare_scenarios
+from utils.scenario_comparison import compare_scenarios_detailed
 
 # Route for the about page
 @app.route('/about')
@@ -248,12 +582,57 @@ def api_compare_scenarios():
         if not data or 'scenarios' not in data:
             return jsonify({'error': 'No scenario data provided'}), 400
         
-        comparison = compare_scenarios(data['scenarios'])
-        return jsonify({'comparison': comparison})
+        comparison = compare_scenarios_detailed(data['scenarios'], data.get('missing', 'null'))
+        return jsonify({
+            'comparison': comparison['rows'],
+            'summary': comparison['summary'],
+            'differences': comparison['differences']
+        })
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logging.error(f"Error comparing scenarios: {str(e)}")
         return jsonify({'error': 'An error occurred while comparing scenarios'}), 500
 
+def _cache_metrics():
+    flights = PIPELINE_FLIGHTS.stats()
+    samples = []
+    for prefix, label, cache in (('climate_result_cache', 'result', RESULT_CACHE),
+                                 ('climate_llm_cache', 'LLM response', LLM_RESPONSE_CACHE)):
+        stats = cache.stats()
+        samples += [
+            (f'{prefix}_events_total', 'counter', f'Lookups and removals in the {label} cache by outcome.',
+             stats[event], {'event': event})
+            for event in ('hits', 'misses', 'evictions', 'expirations')
+        ]
+        samples.append((f'{prefix}_entries', 'gauge', f'Entries currently held in the {label} cache.',
+                        stats['size'], {}))
+    return samples + [
+        ('climate_pipeline_runs_total', 'counter', 'Pipeline runs, split into executed and coalesced calls.',
+         flights['executions'], {'outcome': 'executed'}),
+        ('climate_pipeline_runs_total', 'counter', 'Pipeline runs, split into executed and coalesced calls.',
+         flights['shared'], {'outcome': 'shared'}),
+    ]
+
+REGISTRY.register_collector(_cache_metrics)
+
+# Prometheus scrape endpoint for stage/route latency histograms and cache counters
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    if not METRICS_ENABLED:
+        return jsonify({'error': 'Metrics are disabled'}), 404
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
+
+# API route exposing result cache counters for monitoring
+@app.route('/api/cache_stats', methods=['GET'])
+def api_cache_stats():
+    return jsonify({**RESULT_CACHE.stats(), 'pipeline': PIPELINE_FLIGHTS.stats(), 'llm': LLM_RESPONSE_CACHE.stats()})
+
+# Build the default bundle and compile templates at startup so no request pays
+# for them; gunicorn.conf.py preloads the app so this runs once in the master
+if WARM_UP:
+    warm_up(app)
+
 # Run the Flask app if this script is executed directly
 if __name__ == '__main__':
     app.run(host='0.0.0.0', port=5000)
\ No newline at end of file
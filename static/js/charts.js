@@ -377,20 +377,59 @@ function updateScenarioChart(scenarioType) {
     });
 }
 
+// Sensitivity curve over the slider's whole range, fetched once per economic series
+let sensitivityCurve = null;
+let sensitivityRequest = null;
+let latestSensitivityValue = 50;
+
+// Linearly interpolate every factor of the cached curve at the given slider value
+function interpolateSensitivity(curve, value) {
+    const values = curve.values;
+    const rows = curve.matrix[0];
+    let upper = values.findIndex(v => v >= value);
+    if (upper === -1) upper = values.length - 1;
+    const lower = Math.max(upper - 1, 0);
+    const span = values[upper] - values[lower];
+    const weight = span > 0 ? Math.min(Math.max((value - values[lower]) / span, 0), 1) : 1;
+    const result = {};
+    curve.factors.forEach((factor, index) => {
+        result[factor] = rows[lower][index] + weight * (rows[upper][index] - rows[lower][index]);
+    });
+    return result;
+}
+
+function showSensitivity(data) {
+    if (sensitivityChart) {
+        sensitivityChart.data.labels = Object.keys(data);
+        sensitivityChart.data.datasets[0].data = Object.values(data);
+        sensitivityChart.update();
+    } else {
+        createSensitivityChart(data);
+    }
+}
+
 // Update sensitivity chart based on user input
 function updateSensitivityChart(sensitivityValue) {
     console.log('Updating Sensitivity Chart with value:', sensitivityValue);
     const economicData = getEconomicData();
-    
-    fetch('/api/update_sensitivity', {
+    const key = JSON.stringify(economicData.slice(-1));
+    latestSensitivityValue = parseFloat(sensitivityValue);
+
+    if (sensitivityCurve && sensitivityCurve.key === key) {
+        showSensitivity(interpolateSensitivity(sensitivityCurve, latestSensitivityValue));
+        return;
+    }
+    // Slider events that arrive while the curve is loading are drawn when it lands
+    if (sensitivityRequest && sensitivityRequest.key === key) {
+        return;
+    }
+
+    const request = fetch('/api/sensitivity_sweep', {
         method: 'POST',
         headers: {
             'Content-Type': 'application/json'
         },
-        body: JSON.stringify({ 
-            sensitivity: parseInt(sensitivityValue),
-            economicData: economicData
-        })
+        body: JSON.stringify({ economicData: economicData.slice(-1) })
     })
     .then(response => {
         if (!response.ok) {
@@ -398,19 +437,20 @@ function updateSensitivityChart(sensitivityValue) {
         }
         return response.json();
     })
-    .then(data => {
-        if (sensitivityChart) {
-            sensitivityChart.data.labels = Object.keys(data);
-            sensitivityChart.data.datasets[0].data = Object.values(data);
-            sensitivityChart.update();
-        } else {
-            createSensitivityChart(data);
-        }
+    .then(curve => {
+        sensitivityCurve = { ...curve, key: key };
+        showSensitivity(interpolateSensitivity(sensitivityCurve, latestSensitivityValue));
     })
     .catch(error => {
         console.error('Error updating sensitivity chart:', error);
         showErrorMessage('Error updating sensitivity. Please try again.');
+    })
+    .finally(() => {
+        if (sensitivityRequest && sensitivityRequest.promise === request) {
+            sensitivityRequest = null;
+        }
     });
+    sensitivityRequest = { key: key, promise: request };
 }
 
 // Helper function to get economic data from the chart
@@ -486,7 +526,7 @@ function createComparisonTable(data) {
     // Create rows
     tableHTML += '<tbody>';
     data.forEach(row => {
-        tableHTML += '<tr>' + headers.map(h => `<td class="p-2 border">${row[h]}</td>`).join('') + '</tr>';
+        tableHTML += '<tr>' + headers.map(h => `<td class="p-2 border">${row[h] ?? '&mdash;'}</td>`).join('') + '</tr>';
     });
     tableHTML += '</tbody></table>';
     
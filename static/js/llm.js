@@ -24,7 +24,29 @@ document.addEventListener('DOMContentLoaded', () => {
         llmQueryBtn.disabled = true;
         llmQueryBtn.textContent = 'Processing...';
 
-        fetch('/api/llm_query', {
+        // Stream tokens when the browser supports readable response bodies,
+        // otherwise fall back to the single JSON response
+        const request = (window.ReadableStream && window.TextDecoder)
+            ? streamLLMQuery(query)
+            : fetchLLMQuery(query);
+
+        request
+        .then(text => {
+            llmResponseText.innerHTML = formatResponse(text);
+            saveLLMResponse(query, text);
+        })
+        .catch(error => {
+            console.error('Error performing LLM query:', error);
+            llmResponseText.innerHTML = '<p class="text-red-600">Error processing your query. Please try again.</p>';
+        })
+        .finally(() => {
+            llmQueryBtn.disabled = false;
+            llmQueryBtn.textContent = 'Ask';
+        });
+    }
+
+    function fetchLLMQuery(query) {
+        return fetch('/api/llm_query', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -33,16 +55,69 @@ document.addEventListener('DOMContentLoaded', () => {
         })
         .then(response => response.json())
         .then(data => {
-            llmResponseText.innerHTML = formatResponse(data.response);
-            saveLLMResponse(query, data.response);
-        })
-        .catch(error => {
-            console.error('Error performing LLM query:', error);
-            llmResponseText.innerHTML = '<p class="text-red-600">Error processing your query. Please try again.</p>';
+            if (data.error) {
+                throw new Error(data.error);
+            }
+            return data.response;
+        });
+    }
+
+    // Read server-sent events from /api/llm_query/stream and render the
+    // partial answer as each token arrives; resolves with the full text
+    function streamLLMQuery(query) {
+        return fetch('/api/llm_query/stream', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify({ query: query })
         })
-        .finally(() => {
-            llmQueryBtn.disabled = false;
-            llmQueryBtn.textContent = 'Ask';
+        .then(response => {
+            if (!response.ok || !response.body) {
+                throw new Error(`HTTP error! status: ${response.status}`);
+            }
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            let text = '';
+
+            function handleEvent(rawEvent) {
+                let eventName = 'message';
+                let payload = '';
+                rawEvent.split('\n').forEach(line => {
+                    if (line.startsWith('event:')) {
+                        eventName = line.slice(6).trim();
+                    } else if (line.startsWith('data:')) {
+                        payload += line.slice(5).trim();
+                    }
+                });
+                const data = payload ? JSON.parse(payload) : {};
+                if (eventName === 'error') {
+                    throw new Error(data.error);
+                }
+                if (data.token) {
+                    text += data.token;
+                    llmResponseText.innerHTML = formatResponse(text);
+                }
+                return eventName === 'done';
+            }
+
+            function read() {
+                return reader.read().then(({ done, value }) => {
+                    buffer += decoder.decode(value || new Uint8Array(), { stream: !done });
+                    const events = buffer.split('\n\n');
+                    buffer = events.pop();
+                    for (const rawEvent of events) {
+                        if (rawEvent.trim() && handleEvent(rawEvent)) {
+                            return text;
+                        }
+                    }
+                    return done ? text : read();
+                });
+            }
+
+            return read();
         });
     }
 
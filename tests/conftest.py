@@ -0,0 +1,30 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+
+# Point every store at a scratch directory and keep the LLM offline before main is imported
+_DIRECTORY = tempfile.mkdtemp(prefix='climate-tests-')
+for variable, filename in (('REPLIT_DB_PATH', 'replit.db'), ('DATASET_DB_PATH', 'datasets.db'),
+                           ('REPORT_DB_PATH', 'reports.db'), ('SESSION_DB_PATH', 'sessions.db')):
+    os.environ[variable] = os.path.join(_DIRECTORY, filename)
+os.environ['LLM_BACKEND'] = 'simulator'
+os.environ['WARM_UP'] = '0'
+
+@pytest.fixture(scope='session')
+def app():
+    from main import app
+    app.config['TESTING'] = True
+    yield app
+    shutil.rmtree(_DIRECTORY, ignore_errors=True)
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def make_series(num_years, start_year=1990, slope=0.02):
+    return {
+        'temperatureData': [{'year': start_year + i, 'temperature': 14 + slope * i} for i in range(num_years)],
+        'economicData': [{'year': start_year + i, 'gdp': 100.0 + i} for i in range(num_years)]
+    }
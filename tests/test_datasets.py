@@ -0,0 +1,57 @@
+import io
+
+from utils.datasets import MAX_YEAR, ingest_rows, read_rows
+
+CSV = 'year,temperature,gdp\n2000,14.0,100\n2001,14.1,101\n2002,14.3,102\n'
+
+def _ingest(text, format_type='csv'):
+    return ingest_rows(read_rows(io.StringIO(text), format_type))
+
+def test_rejected_rows_are_counted_and_described():
+    dataset, report = _ingest('year,temperature,gdp\n2000,14.0,100\nabc,1,1\n2001.5,1,1\n2001,,\n2002,nan,1\n'
+                              '2003,14.2,\n')
+    assert report['rows'] == 2
+    assert report['rejected'] == 4
+    assert [error['line'] for error in report['errors']] == [3, 4, 5, 6]
+    temperature, gdp = dataset.region()
+    assert temperature.years.tolist() == [2000, 2003]
+    assert gdp.years.tolist() == [2000]
+
+def test_duplicate_years_keep_the_last_row():
+    dataset, report = _ingest('year,temperature\n2001,14.1\n2000,13.0\n2001,15.5\n2000,13.9\n')
+    assert report['duplicates'] == 2
+    temperature, _ = dataset.region()
+    assert temperature.years.tolist() == [2000, 2001]
+    assert temperature.values.tolist() == [13.9, 15.5]
+
+def test_regions_without_temperature_are_rejected():
+    dataset, report = _ingest('{"year": 2000, "temperature": 14, "region": "a"}\n'
+                              '{"year": 2000, "gdp": 100, "region": "b"}\n'
+                              '{"year": 2001, "gdp": 101, "region": "b"}\n', 'ndjson')
+    assert list(dataset.regions) == ['a']
+    assert report['rejected'] == 2
+    assert report['errors'] == [{'region': 'b', 'error': 'region has no temperature data'}]
+
+def test_out_of_range_years_are_rejected():
+    dataset, report = _ingest(f'year,temperature\n1e300,14\n{MAX_YEAR + 1},14\n-1e9,14\n2000,14\n')
+    assert report['rejected'] == 3
+    assert dataset.region()[0].years.tolist() == [2000]
+
+def test_ingest_raw_body_with_curl_content_type(client):
+    # curl --data-binary sends application/x-www-form-urlencoded unless told otherwise
+    response = client.post('/api/datasets?format=csv', data=CSV.encode(),
+                           content_type='application/x-www-form-urlencoded')
+    assert response.status_code == 201
+    assert response.get_json()['rows'] == 3
+
+def test_ingest_multipart_upload(client):
+    response = client.post('/api/datasets', data={'file': (io.BytesIO(CSV.encode()), 'series.csv'),
+                                                  'name': 'upload'}, content_type='multipart/form-data')
+    assert response.status_code == 201
+    body = response.get_json()
+    assert body['name'] == 'upload'
+    assert body['rows'] == 3
+
+def test_ingest_with_no_valid_rows_is_rejected(client):
+    response = client.post('/api/datasets?format=csv', data=b'year,gdp\n2000,1\n', content_type='text/csv')
+    assert response.status_code == 400
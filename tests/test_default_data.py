@@ -0,0 +1,23 @@
+import gzip
+import json
+
+def test_gzip_and_identity_have_distinct_etags(client):
+    identity = client.get('/api/get_default_data', headers={'Accept-Encoding': 'identity'})
+    compressed = client.get('/api/get_default_data', headers={'Accept-Encoding': 'gzip'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(compressed.get_data())) == identity.get_json()
+    assert identity.headers['ETag'] != compressed.headers['ETag']
+
+def test_conditional_request_matches_only_its_representation(client):
+    identity_etag = client.get('/api/get_default_data', headers={'Accept-Encoding': 'identity'}).headers['ETag']
+    gzip_etag = client.get('/api/get_default_data', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+
+    assert client.get('/api/get_default_data', headers={'Accept-Encoding': 'gzip',
+                                                         'If-None-Match': gzip_etag}).status_code == 304
+    assert client.get('/api/get_default_data', headers={'Accept-Encoding': 'identity',
+                                                         'If-None-Match': identity_etag}).status_code == 304
+    # A gzip validator must not revalidate the identity bytes, or the reverse
+    assert client.get('/api/get_default_data', headers={'Accept-Encoding': 'identity',
+                                                         'If-None-Match': gzip_etag}).status_code == 200
+    assert client.get('/api/get_default_data', headers={'Accept-Encoding': 'gzip',
+                                                         'If-None-Match': identity_etag}).status_code == 200
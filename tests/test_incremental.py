@@ -0,0 +1,79 @@
+import numpy as np
+import pytest
+
+from utils.data_processor import analyze_data
+from utils.incremental import INCREMENTAL_STATES, incremental_analyze
+
+def _payload(years, temperatures):
+    return {
+        'temperatureData': [{'year': int(year), 'temperature': float(value)}
+                            for year, value in zip(years, temperatures)],
+        'economicData': [{'year': int(year), 'gdp': 100.0 + index} for index, year in enumerate(years)]
+    }
+
+def _edits():
+    rng = np.random.default_rng(21)
+    years = list(range(1950, 2020))
+    temperatures = list(14 + 0.02 * np.arange(len(years)) + rng.normal(0, 0.1, len(years)))
+    yield 'initial', years, temperatures
+    years, temperatures = years + [2020], temperatures + [15.6]
+    yield 'append one year', years, temperatures
+    years, temperatures = years + [2021, 2022, 2023], temperatures + [15.7, 15.5, 15.9]
+    yield 'append several years', years, temperatures
+    temperatures = temperatures[:-1] + [16.2]
+    yield 'edit the tail', years, temperatures
+    temperatures = temperatures[:30] + [temperatures[30] - 0.7] + temperatures[31:]
+    yield 'edit mid-series', years, temperatures
+    years, temperatures = years[:-5], temperatures[:-5]
+    yield 'truncate', years, temperatures
+    years, temperatures = years[:-1] + [2030], temperatures[:-1] + [15.0]
+    yield 'replace the last year', years, temperatures
+
+@pytest.mark.parametrize('seed', [None, 21])
+def test_incremental_matches_full_recompute(seed):
+    key = ('test', seed)
+    INCREMENTAL_STATES.delete(key)
+    for step, years, temperatures in _edits():
+        data = _payload(years, temperatures)
+        result, series = incremental_analyze(key, data, seed=seed)
+        expected, expected_series = analyze_data(data, seed=seed)
+        for field, value in (('temperatureData', 'temperature'), ('economicData', 'gdp')):
+            assert [point['year'] for point in result[field]] == [point['year'] for point in expected[field]], step
+            assert np.allclose([point[value] for point in result[field]], [point[value] for point in expected[field]],
+                               rtol=1e-9, atol=1e-9), step
+        assert np.array_equal(series.years, expected_series.years), step
+        assert np.allclose(series.values, expected_series.values, rtol=1e-9, atol=1e-9), step
+        if seed is not None:
+            for metric, value in expected['riskMetrics'].items():
+                assert np.isclose(result['riskMetrics'][metric], value, rtol=1e-9, atol=1e-9), (step, metric)
+    INCREMENTAL_STATES.delete(key)
+
+def test_tail_edits_patch_the_state_instead_of_rebuilding():
+    key = ('test', 'patch')
+    INCREMENTAL_STATES.delete(key)
+    edits = _edits()
+    _, years, temperatures = next(edits)
+    incremental_analyze(key, _payload(years, temperatures))
+    state = INCREMENTAL_STATES.get(key)
+    _, years, temperatures = next(edits)
+    incremental_analyze(key, _payload(years, temperatures))
+    assert INCREMENTAL_STATES.get(key) is state
+    assert state.updates == 1
+    INCREMENTAL_STATES.delete(key)
+
+@pytest.mark.parametrize('seed', [None, 22])
+def test_incremental_run_records_monte_carlo_once(seed):
+    from utils.metrics import REGISTRY
+
+    def monte_carlo_count():
+        histograms = REGISTRY._histograms
+        return sum(histogram.snapshot()[1] for (name, labels), histogram in histograms.items()
+                   if ('stage', 'monte_carlo') in labels)
+
+    key = ('test', 'timing', seed)
+    INCREMENTAL_STATES.delete(key)
+    _, years, temperatures = next(_edits())
+    before = monte_carlo_count()
+    incremental_analyze(key, _payload(years, temperatures), seed=seed)
+    assert monte_carlo_count() - before == 1
+    INCREMENTAL_STATES.delete(key)
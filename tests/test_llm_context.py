@@ -0,0 +1,31 @@
+import pytest
+
+from conftest import make_series
+from utils.data_processor import default_scenario_specs, evaluate_scenarios
+from utils.llm_context import build_context, estimate_tokens
+from utils.series import Series
+
+def _payload(num_years, name_length=10):
+    data = make_series(num_years, start_year=2000 - num_years)
+    base = Series.from_records(data['temperatureData'], 'temperature')
+    specs = [{**spec, 'name': spec['name'] + 'x' * name_length} for spec in default_scenario_specs()]
+    specs += [{'name': f"{'scenario-' * (name_length // 9 + 1)}{index}", 'modifier': index / 10, 'ramp': 'linear',
+               'startYear': None} for index in range(50)]
+    data['scenarioData'] = {'baseline': data['temperatureData'],
+                            **{name: series.to_records() for name, series in evaluate_scenarios(base, specs).items()}}
+    data['riskMetrics'] = {'mean_temperature': 15.1, 'var_95': 15.9, 'max_temperature': 16.7}
+    return data
+
+@pytest.mark.parametrize('num_years', [2, 200, 5_000])
+@pytest.mark.parametrize('name_length', [0, 500])
+@pytest.mark.parametrize('budget', [1, 16, 64, 256, 1024])
+def test_context_never_exceeds_token_budget(num_years, name_length, budget):
+    context = build_context(_payload(num_years, name_length), token_budget=budget)
+    assert estimate_tokens(context) <= budget
+
+def test_context_keeps_sections_with_partial_risk_metrics():
+    data = _payload(30)
+    data['riskMetrics'] = {'var_95': 15.9}
+    context = build_context(data, token_budget=4096)
+    assert 'VaR 95 15.90' in context
+    assert 'Scenario ' in context
@@ -0,0 +1,22 @@
+import asyncio
+
+from utils.cache import ResultCache
+from utils.llm_integration import LLMClient
+
+def test_async_client_works_across_event_loops():
+    client = LLMClient('simulator', max_concurrency=1, cache=ResultCache(maxsize=16))
+
+    async def hold_slot_then_query(tag, index):
+        # Contend for the single slot so the semaphore is bound to this loop
+        slots = client._loop_state()['slots']
+        async with slots:
+            await asyncio.sleep(0.01)
+        return await client.acomplete(f'{tag} question {index}')
+
+    async def burst(tag):
+        return await asyncio.gather(*(hold_slot_then_query(tag, index) for index in range(3)))
+
+    for tag in ('first', 'second', 'third'):
+        assert all(asyncio.run(burst(tag)))
+    # Only the most recent (closed) loop's state is still held
+    assert len(client._loop_states) == 1
@@ -0,0 +1,34 @@
+from utils.metrics import MetricsRegistry
+
+def _families(text):
+    # Family names in the order their samples appear, one entry per contiguous group
+    groups = []
+    for line in text.splitlines():
+        if line.startswith('#'):
+            continue
+        name = line.split('{')[0].split(' ')[0]
+        for suffix in ('_bucket', '_sum', '_count'):
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        if not groups or groups[-1] != name:
+            groups.append(name)
+    return groups
+
+def test_collector_samples_of_one_family_are_grouped():
+    registry = MetricsRegistry()
+    registry.observe('stage_seconds', 0.1, stage='a')
+    registry.register_collector(lambda: [
+        ('events_total', 'counter', 'Events.', 1, {'cache': 'results'}),
+        ('entries', 'gauge', 'Entries.', 2, {'cache': 'results'}),
+        ('events_total', 'counter', 'Events.', 3, {'cache': 'llm'}),
+    ])
+    registry.register_collector(lambda: [('entries', 'gauge', 'Entries.', 4, {'cache': 'llm'})])
+    text = registry.render()
+    groups = _families(text)
+    assert len(groups) == len(set(groups)) == 3
+    assert text.count('# TYPE events_total counter') == 1
+
+def test_metrics_endpoint_families_are_contiguous(client):
+    groups = _families(client.get('/metrics').get_data(as_text=True))
+    assert len(groups) == len(set(groups))
+    assert {'climate_result_cache_events_total', 'climate_llm_cache_events_total'} <= set(groups)
@@ -0,0 +1,24 @@
+import os
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from utils import data_processor
+from utils.data_processor import streaming_risk_metrics
+
+def _metrics(workers):
+    return streaming_risk_metrics(4000, 14.0, 0.1, horizon=10, seed=3, chunk_size=1000, workers=workers)
+
+def test_process_pool_matches_serial_run():
+    assert _metrics(2) == _metrics(1)
+
+def test_concurrent_callers_share_one_pool():
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        pools = list(executor.map(lambda _: data_processor._get_process_pool(2), range(8)))
+    assert len({id(pool) for pool in pools}) == 1
+
+def test_broken_pool_is_rebuilt():
+    expected = _metrics(1)
+    pool = data_processor._get_process_pool(2)
+    # Kill a worker process, which leaves the executor permanently broken
+    wait([pool.submit(os._exit, 1)])
+    assert _metrics(2) == expected
+    assert data_processor._get_process_pool(2) is not pool
@@ -0,0 +1,75 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import make_series
+from utils import pipeline
+from utils.pipeline import PIPELINE_FLIGHTS
+
+def test_concurrent_identical_requests_share_one_computation(app, monkeypatch):
+    num_clients = 8
+    computations = []
+    compute = pipeline._compute_pipeline
+
+    def slow_compute(*args, **kwargs):
+        # Hold the leader until every other client has joined its flight
+        computations.append(threading.get_ident())
+        deadline = time.monotonic() + 10
+        while PIPELINE_FLIGHTS.stats()['shared'] < before['shared'] + num_clients - 1:
+            assert time.monotonic() < deadline, "clients did not overlap"
+            time.sleep(0.01)
+        return compute(*args, **kwargs)
+
+    monkeypatch.setattr(pipeline, '_compute_pipeline', slow_compute)
+    # A seed no other test uses, so the result cache cannot answer first
+    payload = {**make_series(30), 'seed': 6006}
+    before = PIPELINE_FLIGHTS.stats()
+    start = threading.Barrier(num_clients)
+
+    def post(_):
+        client = app.test_client()
+        start.wait()
+        response = client.post('/api/process_data', json=payload)
+        return response.status_code, response.get_data()
+
+    with ThreadPoolExecutor(max_workers=num_clients) as executor:
+        responses = list(executor.map(post, range(num_clients)))
+
+    after = PIPELINE_FLIGHTS.stats()
+    assert len(computations) == 1
+    assert after['executions'] - before['executions'] == 1
+    assert after['shared'] - before['shared'] == num_clients - 1
+    assert all(status == 200 for status, _ in responses)
+    assert len({body for _, body in responses}) == 1
+
+def test_routes_share_the_pipeline_result(client):
+    payload = {**make_series(20), 'seed': 6007}
+    processed = client.post('/api/process_data', json=payload).get_json()
+    analytics = client.post('/api/advanced_analytics', json=payload).get_json()
+    assert processed == analytics
+    assert set(processed) >= {'temperatureData', 'economicData', 'riskMetrics', 'scenarioData', 'sensitivityData'}
+
+def test_pipeline_records_every_stage(client):
+    client.post('/api/process_data', json={**make_series(15), 'seed': 6008})
+    metrics = client.get('/metrics').get_data(as_text=True)
+    for stage in ('regression', 'monte_carlo', 'scenarios', 'sensitivity'):
+        assert f'stage="{stage}"' in metrics
+
+def test_parameters_only_body_uses_the_default_series(client):
+    for path in ('/api/process_data', '/api/advanced_analytics'):
+        response = client.post(path, json={'seed': 1})
+        assert response.status_code == 200
+        assert response.get_json()['temperatureData']
+    assert client.post('/api/process_data', json={'seed': 1, 'incremental': True}).status_code == 200
+    assert client.post('/api/reports', json={'seed': 1}).status_code in (200, 202)
+
+def test_parameters_only_body_uses_the_session_series(client):
+    series = make_series(12)
+    client.post('/api/process_data', json={**series, 'seed': 6009})
+    result = client.post('/api/process_data', json={'seed': 6010}).get_json()
+    assert result['temperatureData'][:12] == series['temperatureData']
+
+def test_empty_or_malformed_series_is_rejected(client):
+    assert client.post('/api/process_data', json={'temperatureData': []}).status_code == 400
+    assert client.post('/api/advanced_analytics', json={'temperatureData': [{'year': 2000}]}).status_code == 400
+    assert client.post('/generate_report', json={'temperatureData': []}).status_code == 400
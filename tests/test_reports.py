@@ -0,0 +1,28 @@
+import time
+
+from conftest import make_series
+from utils.sqlite_store import SQLiteStore
+
+def test_exists_does_not_decode_and_honours_expiry(tmp_path, monkeypatch):
+    store = SQLiteStore(str(tmp_path / 'store.db'), ttl=60)
+    store.set('report', '<html>' * 1000)
+    monkeypatch.setattr('utils.sqlite_store.decode_payload', lambda blob: (_ for _ in ()).throw(AssertionError))
+    assert store.exists('report')
+    assert 'report' in store
+    assert not store.exists('missing')
+    monkeypatch.setattr(time, 'time', lambda: 10**12)
+    assert not store.exists('report')
+
+def test_report_is_decoded_once_per_request(client, monkeypatch):
+    payload = {**make_series(10), 'seed': 2323}
+    assert client.post('/generate_report', json=payload).status_code == 200
+
+    from main import reports
+    reads = []
+    get = reports.store.get
+    monkeypatch.setattr(reports.store, 'get', lambda key, default=None: reads.append(key) or get(key, default))
+    response = client.post('/generate_report', json=payload)
+    assert response.status_code == 200
+    assert len(reads) == 1
+    assert client.get(f'/api/reports/{reads[0]}').get_json()['status'] == 'done'
+    assert len(reads) == 1
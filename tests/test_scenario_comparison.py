@@ -0,0 +1,57 @@
+import pytest
+
+from utils.scenario_comparison import compare_scenarios_detailed
+
+def _points(pairs):
+    return [{'year': year, 'temperature': value} for year, value in pairs]
+
+SCENARIOS = {
+    'baseline': _points([(2020, 14.0), (2021, 14.2), (2022, 14.4), (2023, 14.6)]),
+    'gappy': _points([(2020, 15.0), (2023, 15.6)]),
+}
+
+def test_missing_years_are_null_by_default():
+    rows = compare_scenarios_detailed(SCENARIOS)['rows']
+    assert [row['Year'] for row in rows] == [2020, 2021, 2022, 2023]
+    assert [row['gappy'] for row in rows] == [15.0, None, None, 15.6]
+
+def test_missing_years_interpolate_between_neighbours_only():
+    scenarios = {**SCENARIOS, 'short': _points([(2021, 13.0), (2022, 13.5)])}
+    rows = compare_scenarios_detailed(scenarios, missing='interpolate')['rows']
+    assert [row['gappy'] for row in rows] == pytest.approx([15.0, 15.2, 15.4, 15.6])
+    # Never extrapolated past the scenario's own first and last years
+    assert [row['short'] for row in rows] == [None, 13.0, 13.5, None]
+
+def test_summary_and_pairwise_differences():
+    result = compare_scenarios_detailed(SCENARIOS, missing='interpolate')
+    baseline = result['summary']['baseline']
+    assert baseline['count'] == 4
+    assert baseline['mean'] == pytest.approx(14.3)
+    assert baseline['change'] == pytest.approx(0.6)
+    difference = result['differences']['gappy - baseline']
+    assert difference['count'] == 4
+    assert difference['mean'] == pytest.approx(1.0)
+    assert difference['min'] == pytest.approx(1.0) and difference['max'] == pytest.approx(1.0)
+
+def test_pairwise_differences_skip_years_missing_in_either():
+    difference = compare_scenarios_detailed(SCENARIOS)['differences']['gappy - baseline']
+    assert difference['count'] == 2
+    assert difference['start'] == pytest.approx(1.0)
+    assert difference['end'] == pytest.approx(1.0)
+
+def test_empty_scenario_keeps_integer_years():
+    result = compare_scenarios_detailed({'a': _points([(2020, 14.0), (2021, 14.1)]), 'b': []})
+    assert [row['Year'] for row in result['rows']] == [2020, 2021]
+    assert all(isinstance(row['Year'], int) for row in result['rows'])
+    assert [row['b'] for row in result['rows']] == [None, None]
+    assert result['summary']['b']['count'] == 0
+
+def test_unknown_missing_mode_is_rejected(client):
+    response = client.post('/api/compare_scenarios', json={'scenarios': SCENARIOS, 'missing': 'zero'})
+    assert response.status_code == 400
+
+def test_compare_route_returns_integer_years(client):
+    response = client.post('/api/compare_scenarios', json={'scenarios': {'a': SCENARIOS['baseline'], 'b': []}})
+    assert response.status_code == 200
+    assert response.get_json()['comparison'][0]['Year'] == 2020
+    assert isinstance(response.get_json()['comparison'][0]['Year'], int)
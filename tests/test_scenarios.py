@@ -0,0 +1,17 @@
+from conftest import make_series
+
+def test_non_finite_scenario_values_are_rejected(client):
+    data = make_series(10)
+    # Python's json module writes these as Infinity/NaN, as a client's 1e999 would parse
+    for spec in ({'name': 'a', 'startYear': float('inf')}, {'name': 'a', 'modifier': float('nan')},
+                 {'name': 'a', 'modifier': float('-inf')}, {'name': 'a', 'startYear': 1e300}):
+        response = client.post('/api/batch_scenarios', json={**data, 'scenarios': [spec]})
+        assert response.status_code == 400, spec
+        response = client.post('/api/sensitivity_sweep', json={'economicData': data['economicData'],
+                                                               'scenarios': [spec]})
+        assert response.status_code == 400, spec
+
+def test_unsorted_years_still_ramp(client):
+    data = {'temperatureData': [{'year': year, 'temperature': 14.0} for year in (2010, 2000, 2005, 2001)]}
+    scenarios = client.post('/api/update_scenario', json={**data, 'scenario': 'pessimistic'}).get_json()
+    assert [point['temperature'] for point in scenarios['pessimistic']] == [14.0, 14.125, 14.25, 14.375]
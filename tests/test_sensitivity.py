@@ -0,0 +1,18 @@
+from conftest import make_series
+
+def test_sweep_caps_values_times_scenarios(client):
+    economic = make_series(5)['economicData']
+    scenarios = [{'name': f'scenario-{index}', 'modifier': index / 100} for index in range(1000)]
+    response = client.post('/api/sensitivity_sweep', json={'economicData': economic, 'scenarios': scenarios,
+                                                           'grid': {'start': 0, 'stop': 100, 'step': 0.02}})
+    assert response.status_code == 400
+    assert 'scenarios + 1' in response.get_json()['error']
+
+def test_sweep_within_the_cap(client):
+    economic = make_series(5)['economicData']
+    response = client.post('/api/sensitivity_sweep', json={'economicData': economic, 'scenarios': True,
+                                                           'grid': {'start': 0, 'stop': 100, 'step': 1}})
+    assert response.status_code == 200
+    result = response.get_json()
+    assert len(result['matrix']) == len(result['scenarios'])
+    assert len(result['matrix'][0]) == len(result['values'])
@@ -0,0 +1,32 @@
+from conftest import make_series
+
+def _count_loads(app, monkeypatch):
+    store = app.session_interface.store
+    loads = []
+    get = store.get
+
+    def counting_get(sid):
+        loads.append(sid)
+        return get(sid)
+    monkeypatch.setattr(store, 'get', counting_get)
+    return loads
+
+def test_session_payload_is_loaded_only_when_used(app, monkeypatch):
+    client = app.test_client()
+    assert client.post('/api/process_data', json={**make_series(10), 'seed': 9009}).status_code == 200
+    loads = _count_loads(app, monkeypatch)
+
+    assert client.get('/metrics').status_code == 200
+    assert client.get('/about').status_code == 200
+    assert loads == []
+
+    data = client.get('/api/get_default_data').get_json()
+    assert len(loads) == 1
+    assert data['temperatureData'][:10] == make_series(10)['temperatureData']
+
+def test_expired_session_starts_over(app):
+    client = app.test_client()
+    client.post('/api/process_data', json={**make_series(10), 'seed': 9010})
+    app.session_interface.store.delete(client.get_cookie('session').value.split('.')[0])
+    response = client.get('/api/get_default_data')
+    assert response.headers['Cache-Control'] != 'no-store'
@@ -1,11 +1,13 @@
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from scipy.stats import norm
+
+# scikit-learn and scipy take seconds to import, so they are loaded inside the
+# functions that need them rather than with this module
 
 def linear_regression_temperature(years, temperatures):
     """
     Perform linear regression to predict future temperatures.
     """
+    from sklearn.linear_model import LinearRegression
     X = np.array(years).reshape(-1, 1)
     y = np.array(temperatures)
     model = LinearRegression()
@@ -31,6 +33,7 @@ def monte_carlo_simulation(num_simulations, base_temperature, volatility):
     """
     Perform Monte Carlo simulation for temperature change risk assessment.
     """
+    from scipy.stats import norm
     simulations = []
     for _ in range(num_simulations):
         annual_changes = norm.rvs(0, volatility, 30)  # Simulate 30 years
@@ -1,122 +1,339 @@
 import numpy as np
-from sklearn.linear_model import LinearRegression
-from scipy.stats import norm
 import json
-from io import StringIO
-import csv
 import logging
+import os
+import atexit
+import threading
+from utils.cache import ResultCache, cached
+from utils.exporter import iter_csv
+from utils.log_utils import LazySummary
+from utils.metrics import timed, timed_stage
+from utils.series import Series
 
+DEFAULT_NUM_SIMULATIONS = 1000
+DEFAULT_HORIZON = 30
+DEFAULT_CHUNK_SIZE = 50_000
+RISK_MODES = ('exact', 'streaming')
+# Number of processes used by streaming risk simulations (1 = run in-process)
+MONTE_CARLO_WORKERS = int(os.environ.get('MONTE_CARLO_WORKERS', 1))
+
+# Shared cache for pipeline results, keyed on the input series and model parameters
+RESULT_CACHE = ResultCache(maxsize=int(os.environ.get('RESULT_CACHE_SIZE', 256)),
+                           ttl=float(os.environ.get('RESULT_CACHE_TTL', 600)))
+
+# Built-in example series used when a request carries no data. Shared by every
+# caller, so treat it as read-only.
 DEFAULT_DATA = {
-    "temperatureData": [
-        {"year": 2000, "temperature": 14.8},
-        {"year": 2010, "temperature": 15.2},
-        {"year": 2020, "temperature": 15.5},
-        {"year": 2030, "temperature": 15.9}
+    'temperatureData': [
+        {'year': 2020, 'temperature': 14.5},
+        {'year': 2021, 'temperature': 14.6},
+        {'year': 2022, 'temperature': 14.7},
     ],
-    "economicData": [
-        {"year": 2000, "gdp": 33.6},
-        {"year": 2010, "gdp": 65.9},
-        {"year": 2020, "gdp": 84.5},
-        {"year": 2030, "gdp": 100.0}
+    'economicData': [
+        {'year': 2020, 'gdp': 84.54},
+        {'year': 2021, 'gdp': 94.58},
+        {'year': 2022, 'gdp': 100.36},
     ]
 }
 
 def load_default_data():
-    # This is a placeholder. Replace with actual default data loading logic.
-    return {
-        'temperatureData': [
-            {'year': 2020, 'temperature': 14.5},
-            {'year': 2021, 'temperature': 14.6},
-            {'year': 2022, 'temperature': 14.7},
-        ],
-        'economicData': [
-            {'year': 2020, 'gdp': 84.54},
-            {'year': 2021, 'gdp': 94.58},
-            {'year': 2022, 'gdp': 100.36},
-        ],
-        'riskMetrics': {
-            'mean_temperature': 14.6,
-            'var_95': 15.2,
-            'max_temperature': 15.5
-        },
-        'scenarioData': {
-            'baseline': [
-                {'year': 2020, 'temperature': 14.5},
-                {'year': 2021, 'temperature': 14.6},
-                {'year': 2022, 'temperature': 14.7},
-            ],
-            'optimistic': [
-                {'year': 2020, 'temperature': 14.5},
-                {'year': 2021, 'temperature': 14.55},
-                {'year': 2022, 'temperature': 14.6},
-            ],
-            'pessimistic': [
-                {'year': 2020, 'temperature': 14.5},
-                {'year': 2021, 'temperature': 14.65},
-                {'year': 2022, 'temperature': 14.8},
-            ]
-        },
-        'sensitivityData': {
-            'GDP': 0.8,
-            'Population': 0.6,
-            'CO2 Emissions': 0.9,
-            'Renewable Energy': 0.7
-        }
-    }
+    """
+    The default input series. The processed dashboard payload built from them
+    lives in utils.default_bundle.
+    """
+    return DEFAULT_DATA
+
+def _series(data, key):
+    return (data or {}).get(key, [])
 
-def process_data(data):
+def _process_data_key(data, num_simulations, horizon, seed, risk_mode, chunk_size, **_):
+    # The worker count does not change the result, so it is not part of the key
+    return (_series(data, 'temperatureData'), _series(data, 'economicData'),
+            num_simulations, horizon, seed, risk_mode, chunk_size)
+
+def project_series(temperature, horizon=DEFAULT_HORIZON):
+    """
+    Fit the trend of a temperature Series and project `horizon` years ahead.
+    Returns (future temperatures, future economic impacts) as Series.
+    """
+    with timed('regression'):
+        model = LinearTrend().fit(temperature.years, temperature.values)
+        last_year = int(temperature.years.max())
+        future_years = np.arange(last_year + 1, last_year + horizon + 1)
+        predicted = model.predict(future_years)
+    impacts = calculate_economic_impact(predicted - temperature.values[-1])
+    return Series(future_years, predicted, 'temperature'), Series(future_years, impacts, 'gdp')
+
+def simulate_risk(base_temperature, num_simulations=DEFAULT_NUM_SIMULATIONS, horizon=DEFAULT_HORIZON, seed=None,
+                  risk_mode='exact', chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    if risk_mode not in RISK_MODES:
+        raise ValueError(f"Unsupported risk mode: {risk_mode}")
+    with timed('monte_carlo'):
+        if risk_mode == 'streaming':
+            return streaming_risk_metrics(num_simulations, base_temperature, volatility=0.1, horizon=horizon,
+                                          seed=seed, chunk_size=chunk_size, workers=workers)
+        simulations = monte_carlo_simulation(num_simulations, base_temperature, volatility=0.1,
+                                             horizon=horizon, seed=seed)
+        return calculate_risk_metrics(simulations)
+
+def analyze_data(data, num_simulations=DEFAULT_NUM_SIMULATIONS, horizon=DEFAULT_HORIZON, seed=None,
+                 risk_mode='exact', chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    Columnar core of process_data. Returns the process_data result together with
+    the full (historical + projected) temperature Series for downstream stages.
+    """
     if not data:
         data = load_default_data()
     
     temperature_data = data.get("temperatureData", [])
     economic_data = data.get("economicData", [])
     
-    years = [entry["year"] for entry in temperature_data]
-    temperatures = [entry["temperature"] for entry in temperature_data]
-    
-    model = linear_regression_temperature(years, temperatures)
-    
-    future_years = list(range(max(years) + 1, max(years) + 31))
-    future_temperatures = [predict_temperature(model, year) for year in future_years]
+    if risk_mode not in RISK_MODES:
+        raise ValueError(f"Unsupported risk mode: {risk_mode}")
     
-    base_temperature = temperatures[-1]
-    economic_impacts = [calculate_economic_impact(temp - base_temperature) for temp in future_temperatures]
+    temperature = Series.from_records(temperature_data, 'temperature')
+    future_temperature, future_economic = project_series(temperature, horizon)
+    risk_metrics = simulate_risk(float(temperature.values[-1]), num_simulations, horizon, seed, risk_mode,
+                                 chunk_size, workers)
     
-    simulations = monte_carlo_simulation(1000, base_temperature, volatility=0.1)
-    risk_metrics = calculate_risk_metrics(simulations)
-    
-    return {
-        "temperatureData": temperature_data + [{"year": year, "temperature": temp} for year, temp in zip(future_years, future_temperatures)],
-        "economicData": economic_data + [{"year": year, "gdp": impact} for year, impact in zip(future_years, economic_impacts)],
+    # Historical points are passed through; only projected years become new dicts
+    result = {
+        "temperatureData": temperature_data + future_temperature.to_records(),
+        "economicData": economic_data + future_economic.to_records(),
         "riskMetrics": risk_metrics
     }
+    return result, temperature.concat(future_temperature)
+
+@cached(RESULT_CACHE, _process_data_key)
+def process_data(data, num_simulations=DEFAULT_NUM_SIMULATIONS, horizon=DEFAULT_HORIZON, seed=None,
+                 risk_mode='exact', chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    result, _ = analyze_data(data, num_simulations, horizon, seed, risk_mode, chunk_size, workers)
+    return result
+
+# Batch mode: many regions per call, one fit and one Monte Carlo draw for all of them
+MAX_BATCH_REGIONS = 1000
+# Cap on regions x simulations: the draw holds one float per path (plus a copy for
+# the percentile), so 10^7 paths is about 160 MB at peak
+MAX_BATCH_PATHS = 10_000_000
+
+def fit_trends(series_list):
+    """
+    Least-squares trend lines for many Series at once. The ragged series are
+    concatenated and every per-series sum is a segmented np.bincount, so all fits
+    are one stacked pass with the same centred formulas as LinearTrend.
+    Returns (slopes, intercepts) arrays.
+    """
+    lengths = np.array([len(series) for series in series_list])
+    if not len(lengths) or (lengths == 0).any():
+        raise ValueError("every series must be non-empty")
+    ids = np.repeat(np.arange(len(series_list)), lengths)
+    x = np.concatenate([series.years for series in series_list]).astype(float)
+    y = np.concatenate([series.values for series in series_list])
+    x_mean = np.bincount(ids, x) / lengths
+    y_mean = np.bincount(ids, y) / lengths
+    dx = x - x_mean[ids]
+    sxx = np.bincount(ids, dx * dx)
+    sxy = np.bincount(ids, dx * (y - y_mean[ids]))
+    slopes = np.divide(sxy, sxx, out=np.zeros_like(sxx), where=sxx > 0)
+    return slopes, y_mean - slopes * x_mean
+
+def batch_risk_metrics(base_temperatures, num_simulations, volatility=0.1, horizon=DEFAULT_HORIZON, seed=None):
+    """
+    Risk metrics of monte_carlo_simulation for every base temperature in one
+    broadcast (regions x simulations) draw. The metrics only use each path's final
+    value, and a sum of `horizon` independent N(0, volatility) steps is exactly
+    N(0, volatility * sqrt(horizon)), so the final values are drawn directly.
+    """
+    base_temperatures = np.asarray(base_temperatures, dtype=float)
+    rng = np.random.default_rng(seed)
+    finals = rng.normal(0.0, volatility * np.sqrt(horizon), size=(len(base_temperatures), num_simulations))
+    finals += base_temperatures[:, None]
+    return {
+        'mean_temperature': finals.mean(axis=1),
+        'var_95': np.percentile(finals, 95, axis=1),
+        'max_temperature': finals.max(axis=1)
+    }
+
+def _batch_key(regions, num_simulations, horizon, seed):
+    return ({name: (_series(data, 'temperatureData'), _series(data, 'economicData'))
+             for name, data in regions.items()}, num_simulations, horizon, seed)
+
+@cached(RESULT_CACHE, _batch_key)
+@timed_stage('batch_process')
+def batch_process_data(regions, num_simulations=DEFAULT_NUM_SIMULATIONS, horizon=DEFAULT_HORIZON, seed=None):
+    """
+    process_data for many regions at once: {name: {'temperatureData', 'economicData'}}
+    in, {name: process_data-shaped result} out. Trends are fitted in one stacked
+    solve and the Monte Carlo runs as one broadcast draw (exact risk mode only).
+    With a seed the batch is reproducible; risk metrics match single calls in
+    distribution, not draw for draw.
+    """
+    if not regions:
+        raise ValueError("No regions provided")
+    if len(regions) > MAX_BATCH_REGIONS:
+        raise ValueError(f"At most {MAX_BATCH_REGIONS} regions can be processed per request")
+    if len(regions) * num_simulations > MAX_BATCH_PATHS:
+        raise ValueError(f"regions x numSimulations must be at most {MAX_BATCH_PATHS}")
+    names = list(regions)
+    temperatures = [Series.from_records(_series(regions[name], 'temperatureData'), 'temperature')
+                    for name in names]
+
+    with timed('regression'):
+        slopes, intercepts = fit_trends(temperatures)
+        last_years = np.array([series.years.max() for series in temperatures])
+        last_values = np.array([series.values[-1] for series in temperatures])
+        future_years = last_years[:, None] + np.arange(1, horizon + 1)
+        predicted = intercepts[:, None] + slopes[:, None] * future_years
+    impacts = calculate_economic_impact(predicted - last_values[:, None])
+    with timed('monte_carlo'):
+        risk = batch_risk_metrics(last_values, num_simulations, volatility=0.1, horizon=horizon, seed=seed)
 
+    results = {}
+    for row, name in enumerate(names):
+        years = future_years[row]
+        results[name] = {
+            'temperatureData': list(_series(regions[name], 'temperatureData')) +
+                               Series(years, predicted[row], 'temperature').to_records(),
+            'economicData': list(_series(regions[name], 'economicData')) +
+                            Series(years, impacts[row], 'gdp').to_records(),
+            'riskMetrics': {metric: float(values[row]) for metric, values in risk.items()}
+        }
+    return results
+
+# Built-in scenarios: a modifier ramped linearly over the series
+DEFAULT_SCENARIOS = {
+    'optimistic': {'modifier': -0.5, 'ramp': 'linear', 'startYear': None},
+    'pessimistic': {'modifier': 0.5, 'ramp': 'linear', 'startYear': None}
+}
+RAMP_SHAPES = ('linear', 'quadratic', 'sqrt', 'step')
+MAX_BATCH_SCENARIOS = 1000
+# Bound on |startYear|, in line with the years accepted at dataset ingest
+MAX_SCENARIO_YEAR = 100_000
+
+@cached(RESULT_CACHE, lambda data, scenario_type: (_series(data, 'temperatureData'), scenario_type))
+@timed_stage('scenarios')
 def generate_scenarios(data, scenario_type='all'):
     if not data or 'temperatureData' not in data or not data['temperatureData']:
         data = load_default_data()
     
     base_data = data['temperatureData']
-    years = [entry['year'] for entry in base_data]
-    base_temperatures = [entry['temperature'] for entry in base_data]
-    
-    def generate_scenario(modifier):
-        return [{'year': year, 'temperature': temp + modifier * (i / len(years))} 
-                for i, (year, temp) in enumerate(zip(years, base_temperatures))]
-    
-    scenarios = {
-        'baseline': base_data,
-        'optimistic': generate_scenario(-0.5),
-        'pessimistic': generate_scenario(0.5)
-    }
-    
     if scenario_type == 'all':
-        return scenarios
+        names = ['baseline', *DEFAULT_SCENARIOS]
+    elif scenario_type == 'baseline' or scenario_type in DEFAULT_SCENARIOS:
+        names = [scenario_type]
     else:
-        return {scenario_type: scenarios[scenario_type]}
+        raise KeyError(scenario_type)
+    
+    # Only compute the scenarios that were asked for
+    specs = [{'name': name, **DEFAULT_SCENARIOS[name]} for name in names if name != 'baseline']
+    scenarios = {name: series.to_records() for name, series in evaluate_scenarios(base_data, specs).items()}
+    if 'baseline' in names:
+        scenarios = {'baseline': base_data, **scenarios}
+    return scenarios
+
+def default_scenario_specs():
+    return [{'name': name, **spec} for name, spec in DEFAULT_SCENARIOS.items()]
+
+def normalize_scenario_specs(specs):
+    """
+    Validate a list of scenario definitions ({name, modifier, ramp, startYear}).
+    Raises ValueError on malformed input.
+    """
+    if not isinstance(specs, list) or not specs:
+        raise ValueError("scenarios must be a non-empty list")
+    if len(specs) > MAX_BATCH_SCENARIOS:
+        raise ValueError(f"At most {MAX_BATCH_SCENARIOS} scenarios can be evaluated per request")
+    normalized = []
+    seen = set()
+    for spec in specs:
+        if not isinstance(spec, dict):
+            raise ValueError("Each scenario must be an object")
+        name = spec.get('name')
+        if not isinstance(name, str) or not name:
+            raise ValueError("Each scenario needs a non-empty name")
+        if name in seen:
+            raise ValueError(f"Duplicate scenario name: {name}")
+        seen.add(name)
+        ramp = spec.get('ramp', 'linear')
+        if ramp not in RAMP_SHAPES:
+            raise ValueError(f"Unsupported ramp shape for {name}: {ramp}")
+        # JSON parses 1e999 as inf; non-finite values would overflow int() or
+        # produce NaN/Infinity in the response, which is not valid JSON
+        modifier = float(spec.get('modifier', 0.0))
+        if not np.isfinite(modifier):
+            raise ValueError(f"modifier for {name} must be a finite number")
+        start_year = spec.get('startYear')
+        if start_year is not None:
+            start_year = float(start_year)
+            if not np.isfinite(start_year) or abs(start_year) > MAX_SCENARIO_YEAR:
+                raise ValueError(f"startYear for {name} must be a year between "
+                                 f"{-MAX_SCENARIO_YEAR} and {MAX_SCENARIO_YEAR}")
+            start_year = int(start_year)
+        normalized.append({
+            'name': name,
+            'modifier': modifier,
+            'ramp': ramp,
+            'startYear': start_year
+        })
+    return normalized
 
+def _ramp_matrix(years, specs):
+    # Ramp progress per (scenario, position): 0 before the first position whose
+    # year reaches the start year, then (i - start) / (n - start); without a start
+    # year this is the original i / len(years). Years need not be sorted, so the
+    # start is found by comparing against every year rather than a binary search.
+    n = len(years)
+    index = np.arange(n)
+    start_years = np.array([spec['startYear'] if spec['startYear'] is not None else -np.inf for spec in specs])
+    reached = np.asarray(years)[None, :] >= start_years[:, None]
+    start_index = np.where(reached.any(axis=1), reached.argmax(axis=1), n)[:, None]
+    span = np.maximum(n - start_index, 1)
+    progress = np.clip((index[None, :] - start_index) / span, 0.0, None)
+
+    shapes = np.array([spec['ramp'] for spec in specs])[:, None]
+    ramp = np.where(shapes == 'quadratic', progress ** 2, progress)
+    ramp = np.where(shapes == 'sqrt', np.sqrt(progress), ramp)
+    ramp = np.where(shapes == 'step', (index[None, :] >= start_index).astype(float), ramp)
+    return ramp
+
+def evaluate_scenarios(base, specs):
+    """
+    Evaluate many scenario definitions against a base temperature series (a Series
+    or a list of records) in one vectorized pass and return {name: Series}.
+    """
+    if not specs:
+        return {}
+    base = Series.from_records(base, 'temperature')
+    modifiers = np.array([spec['modifier'] for spec in specs])[:, None]
+    temperatures = base.values[None, :] + modifiers * _ramp_matrix(base.years, specs)
+    return {spec['name']: Series(base.years, row, 'temperature') for spec, row in zip(specs, temperatures)}
+
+# Weight of each sensitivity factor relative to the slider's scale factor
+SENSITIVITY_WEIGHTS = {
+    'temperature_sensitivity': 1.0,
+    'economic_growth_sensitivity': 0.8,
+    'adaptation_sensitivity': 1.2,
+    'technology_sensitivity': 1.5
+}
+MAX_SWEEP_POINTS = 10_000
+# Cap on values x (scenarios + baseline): each cell becomes len(SENSITIVITY_WEIGHTS)
+# numbers in the JSON response, so this bounds it to a few MB
+MAX_SWEEP_CELLS = 100_000
+
+def _latest_economic_value(economic_data):
+    latest = economic_data[-1]
+    if 'gdp' in latest:
+        return float(latest['gdp'])
+    if 'impact' in latest:
+        return float(latest['impact'])
+    raise ValueError(f"No 'gdp' or 'impact' key found in economic data: {latest}")
+
+# Only the latest economic data point feeds the sensitivity calculation
+@cached(RESULT_CACHE, lambda data, sensitivity_value: (_series(data, 'economicData')[-1:], sensitivity_value))
+@timed_stage('sensitivity')
 def perform_sensitivity_analysis(data, sensitivity_value=50):
-    logging.info(f"Starting sensitivity analysis with sensitivity_value: {sensitivity_value}")
-    logging.info(f"Input data structure: {json.dumps(data, indent=2)}")
+    logging.info('Starting sensitivity analysis with sensitivity_value: %s', sensitivity_value)
+    logging.debug('Sensitivity input: %s', LazySummary(data))
 
     if not data or 'economicData' not in data or not data['economicData']:
         logging.warning("No economic data provided for sensitivity analysis")
@@ -128,28 +345,17 @@ def perform_sensitivity_analysis(data, sensitivity_value=50):
         }
     
     try:
-        latest_economic_data = data['economicData'][-1]
-        logging.info(f"Latest economic data: {json.dumps(latest_economic_data, indent=2)}")
-        
-        if 'gdp' in latest_economic_data:
-            base_economic_value = float(latest_economic_data['gdp'])
-        elif 'impact' in latest_economic_data:
-            base_economic_value = float(latest_economic_data['impact'])
-        else:
-            raise ValueError(f"No 'gdp' or 'impact' key found in economic data: {latest_economic_data}")
+        logging.debug('Latest economic data: %s', data['economicData'][-1])
+        base_economic_value = _latest_economic_value(data['economicData'])
         
-        logging.info(f"Base economic value for sensitivity analysis: {base_economic_value}")
+        logging.debug('Base economic value for sensitivity analysis: %s', base_economic_value)
         
         sensitivity_factor = (sensitivity_value / 100) * 2  # Scale factor
         
-        sensitivities = {
-            'temperature_sensitivity': max(0.1, sensitivity_factor * 1.0) * base_economic_value,
-            'economic_growth_sensitivity': max(0.1, sensitivity_factor * 0.8) * base_economic_value,
-            'adaptation_sensitivity': max(0.1, sensitivity_factor * 1.2) * base_economic_value,
-            'technology_sensitivity': max(0.1, sensitivity_factor * 1.5) * base_economic_value
-        }
+        sensitivities = {name: max(0.1, sensitivity_factor * weight) * base_economic_value
+                         for name, weight in SENSITIVITY_WEIGHTS.items()}
         
-        logging.info(f"Calculated sensitivities: {json.dumps(sensitivities, indent=2)}")
+        logging.debug('Calculated sensitivities: %s', sensitivities)
         return sensitivities
 
     except (ValueError, TypeError, IndexError) as e:
@@ -161,46 +367,139 @@ def perform_sensitivity_analysis(data, sensitivity_value=50):
             'technology_sensitivity': 0.1
         }
 
+def sensitivity_grid(start=0, stop=100, step=1):
+    """
+    Evenly spaced sensitivity values from start to stop inclusive.
+    """
+    start, stop, step = float(start), float(stop), float(step)
+    if step <= 0 or stop < start:
+        raise ValueError("A sensitivity grid needs stop >= start and a positive step")
+    count = int(np.floor((stop - start) / step + 1e-9)) + 1
+    if count > MAX_SWEEP_POINTS:
+        raise ValueError(f"A sweep needs between 1 and {MAX_SWEEP_POINTS} sensitivity values")
+    return (start + step * np.arange(count)).tolist()
+
+# The ramp offsets need the economic years, so the whole series only matters when crossed with scenarios
+@cached(RESULT_CACHE, lambda economic_data, values, specs: (economic_data if specs else economic_data[-1:],
+                                                          list(values), specs))
+@timed_stage('sensitivity_sweep')
+def sensitivity_sweep(economic_data, values, specs=None):
+    """
+    perform_sensitivity_analysis over a grid of sensitivity values in one array
+    computation. With scenario specs the grid is crossed with each scenario: its
+    latest economic value is the base value plus the economic impact of the
+    scenario's temperature offset in the final year.
+    Returns {'values', 'factors', 'scenarios', 'matrix'} where matrix[s][v][f] is
+    factor f at values[v] under scenarios[s] (scenarios[0] is the baseline).
+    """
+    if not economic_data:
+        raise ValueError("Economic data is missing or empty")
+    grid = np.asarray(values, dtype=float)
+    if grid.ndim != 1 or not 1 <= len(grid) <= MAX_SWEEP_POINTS:
+        raise ValueError(f"A sweep needs between 1 and {MAX_SWEEP_POINTS} sensitivity values")
+    if not np.isfinite(grid).all():
+        raise ValueError("Sensitivity values must be finite")
+
+    if len(grid) * (len(specs or ()) + 1) > MAX_SWEEP_CELLS:
+        raise ValueError(f"values x (scenarios + 1) must be at most {MAX_SWEEP_CELLS}")
+
+    base_value = _latest_economic_value(economic_data)
+    names = ['baseline']
+    bases = np.array([base_value])
+    if specs:
+        years = np.array([entry['year'] for entry in economic_data])
+        offsets = np.array([spec['modifier'] for spec in specs]) * _ramp_matrix(years, specs)[:, -1]
+        names += [spec['name'] for spec in specs]
+        bases = np.append(bases, base_value + calculate_economic_impact(offsets))
+
+    weights = np.array(list(SENSITIVITY_WEIGHTS.values()))
+    factors = np.maximum(0.1, (grid / 100 * 2)[:, None] * weights[None, :])
+    matrix = bases[:, None, None] * factors[None, :, :]
+    return {
+        'values': grid.tolist(),
+        'factors': list(SENSITIVITY_WEIGHTS),
+        'scenarios': names,
+        'matrix': matrix.tolist()
+    }
+
 def export_data(data, format_type):
+    """
+    Export as one string. Large exports should use utils.exporter.iter_export,
+    which yields the same CSV chunk by chunk.
+    """
     if format_type == 'json':
         return json.dumps(data, indent=2)
     elif format_type == 'csv':
-        output = StringIO()
-        writer = csv.writer(output)
-        
-        headers = set()
-        for item in data:
-            headers.update(item.keys())
-        writer.writerow(headers)
-        
-        for item in data:
-            writer.writerow([item.get(header, '') for header in headers])
-        
-        return output.getvalue()
+        return ''.join(iter_csv(data))
     else:
         raise ValueError(f"Unsupported format: {format_type}")
 
+class LinearTrend:
+    """
+    Two-parameter least-squares trend line fitted in closed form.
+    Years are centred on their mean before fitting to keep the sums well conditioned.
+    """
+
+    def __init__(self):
+        self.slope = 0.0
+        self.intercept = 0.0
+        self.n = 0
+        self.x_mean = 0.0
+        self.sxx = 0.0
+        self.residual_std = 0.0
+
+    def fit(self, years, temperatures):
+        x = np.asarray(years, dtype=float)
+        y = np.asarray(temperatures, dtype=float)
+        if x.size == 0 or x.shape != y.shape:
+            raise ValueError("years and temperatures must be non-empty and of equal length")
+        self.n = x.size
+        self.x_mean = x.mean()
+        y_mean = y.mean()
+        dx = x - self.x_mean
+        self.sxx = float(dx @ dx)
+        self.slope = float(dx @ (y - y_mean) / self.sxx) if self.sxx > 0 else 0.0
+        self.intercept = float(y_mean - self.slope * self.x_mean)
+        residuals = y - (self.intercept + self.slope * x)
+        self.residual_std = float(np.sqrt(residuals @ residuals / (self.n - 2))) if self.n > 2 else 0.0
+        return self
+
+    def predict(self, years):
+        return self.intercept + self.slope * np.asarray(years, dtype=float)
+
+    def predict_interval(self, years, level=0.95):
+        """
+        Return (prediction, lower, upper) arrays for a prediction interval at the given level.
+        """
+        x = np.asarray(years, dtype=float)
+        prediction = self.predict(x)
+        if self.n <= 2 or self.sxx == 0:
+            return prediction, prediction.copy(), prediction.copy()
+        # scipy is only needed for intervals, so keep it off the import path
+        from scipy.stats import t
+        margin = t.ppf(0.5 + level / 2, self.n - 2) * self.residual_std * np.sqrt(
+            1 + 1 / self.n + (x - self.x_mean) ** 2 / self.sxx)
+        return prediction, prediction - margin, prediction + margin
+
+
 def linear_regression_temperature(years, temperatures):
-    X = np.array(years).reshape(-1, 1)
-    y = np.array(temperatures)
-    model = LinearRegression()
-    model.fit(X, y)
-    return model
+    return LinearTrend().fit(years, temperatures)
 
 def predict_temperature(model, year):
-    return model.predict([[year]])[0]
+    return float(model.predict([year])[0])
 
 def calculate_economic_impact(temperature_change):
     gdp_impact = -0.01 * temperature_change
     return gdp_impact
 
-def monte_carlo_simulation(num_simulations, base_temperature, volatility):
-    simulations = []
-    for _ in range(num_simulations):
-        annual_changes = norm.rvs(0, volatility, 30)
-        temperature_path = np.cumsum(annual_changes) + base_temperature
-        simulations.append(temperature_path)
-    return np.array(simulations)
+def monte_carlo_simulation(num_simulations, base_temperature, volatility, horizon=DEFAULT_HORIZON, seed=None):
+    # Draw the whole (simulations x horizon) matrix of annual changes in one call
+    # and accumulate along the year axis; `seed` makes the paths reproducible.
+    rng = np.random.default_rng(seed)
+    annual_changes = rng.normal(0.0, volatility, size=(num_simulations, horizon))
+    simulations = np.cumsum(annual_changes, axis=1)
+    simulations += base_temperature
+    return simulations
 
 def calculate_risk_metrics(simulations):
     final_temperatures = simulations[:, -1]
@@ -212,4 +511,172 @@ def calculate_risk_metrics(simulations):
         "mean_temperature": mean_temp,
         "var_95": var_95,
         "max_temperature": max_temp
-    }
\ No newline at end of file
+    }
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch over a fixed value range.
+    Values are binned into a fixed-width histogram, so merging two sketches is an
+    exact element-wise sum of counts and the result does not depend on how the
+    input was split. Values outside [lo, hi) are counted in the edge bins.
+    """
+
+    def __init__(self, lo, hi, bins=16384):
+        self.lo = float(lo)
+        self.hi = float(hi)
+        self.counts = np.zeros(bins, dtype=np.int64)
+
+    def update(self, values):
+        bins = len(self.counts)
+        scaled = (np.asarray(values, dtype=float) - self.lo) * (bins / (self.hi - self.lo))
+        indices = np.clip(scaled.astype(np.int64), 0, bins - 1)
+        self.counts += np.bincount(indices, minlength=bins)
+
+    def merge(self, other):
+        if (self.lo, self.hi, len(self.counts)) != (other.lo, other.hi, len(other.counts)):
+            raise ValueError("Cannot merge quantile sketches with different ranges")
+        self.counts += other.counts
+        return self
+
+    def quantile(self, q):
+        total = self.counts.sum()
+        if total == 0:
+            return float('nan')
+        # Interpolate linearly inside the bin that contains the q-th observation
+        cumulative = np.cumsum(self.counts)
+        rank = q * total
+        index = int(np.searchsorted(cumulative, rank, side='left'))
+        index = min(index, len(self.counts) - 1)
+        previous = cumulative[index - 1] if index > 0 else 0
+        within = (rank - previous) / self.counts[index] if self.counts[index] else 0.0
+        width = (self.hi - self.lo) / len(self.counts)
+        return float(self.lo + (index + within) * width)
+
+
+class RiskAccumulator:
+    """
+    Running aggregates of simulated final temperatures (count, sum, max and a
+    quantile sketch) that produce the same keys as calculate_risk_metrics.
+    """
+
+    def __init__(self, lo, hi):
+        self.count = 0
+        self.total = 0.0
+        self.max = float('-inf')
+        self.sketch = QuantileSketch(lo, hi)
+
+    def update(self, final_temperatures):
+        if len(final_temperatures) == 0:
+            return
+        self.count += len(final_temperatures)
+        self.total += float(np.sum(final_temperatures))
+        self.max = max(self.max, float(np.max(final_temperatures)))
+        self.sketch.update(final_temperatures)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+        self.sketch.merge(other.sketch)
+        return self
+
+    def to_metrics(self):
+        # The sketch cannot see beyond the observed maximum
+        return {
+            "mean_temperature": self.total / self.count if self.count else float('nan'),
+            "var_95": min(self.sketch.quantile(0.95), self.max),
+            "max_temperature": self.max
+        }
+
+
+def _risk_sketch_range(base_temperature, volatility, horizon):
+    # Final temperatures are base + N(0, volatility^2 * horizon); +/-10 sigma
+    # covers every path we will realistically draw.
+    spread = 10 * volatility * np.sqrt(horizon)
+    return base_temperature - spread, base_temperature + spread
+
+
+def _plan_chunks(num_simulations, chunk_size, seed):
+    # Each chunk gets its own child SeedSequence, so the random stream of a chunk
+    # only depends on the seed and its index, never on who computes it.
+    num_chunks = max(1, -(-num_simulations // chunk_size))
+    sizes = [chunk_size] * (num_chunks - 1) + [num_simulations - chunk_size * (num_chunks - 1)]
+    return list(zip(np.random.SeedSequence(seed).spawn(num_chunks), sizes))
+
+
+def simulate_risk_chunk(seed_sequence, size, base_temperature, volatility, horizon):
+    rng = np.random.default_rng(seed_sequence)
+    accumulator = RiskAccumulator(*_risk_sketch_range(base_temperature, volatility, horizon))
+    # Only the final temperature of each path is needed, i.e. the row sums
+    annual_changes = rng.normal(0.0, volatility, size=(size, horizon))
+    accumulator.update(annual_changes.sum(axis=1) + base_temperature)
+    return accumulator
+
+
+# One pool per worker count, shared across requests and threads. Pools are never
+# swapped out from under a caller; a broken pool is dropped and rebuilt.
+_process_pools = {}
+_process_pools_lock = threading.Lock()
+
+def _get_process_pool(workers):
+    # Reuse pools across requests; spawning worker processes per call would
+    # cost more than the simulation itself.
+    with _process_pools_lock:
+        pool = _process_pools.get(workers)
+        if pool is None:
+            # Only the streaming mode with workers uses processes; keep them off the import path
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+            pool = _process_pools[workers] = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        return pool
+
+def _discard_process_pool(workers, pool):
+    with _process_pools_lock:
+        if _process_pools.get(workers) is pool:
+            del _process_pools[workers]
+    pool.shutdown(wait=False, cancel_futures=True)
+
+@atexit.register
+def _shutdown_process_pools():
+    with _process_pools_lock:
+        pools = list(_process_pools.values())
+        _process_pools.clear()
+    for pool in pools:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def streaming_risk_metrics(num_simulations, base_temperature, volatility, horizon=DEFAULT_HORIZON, seed=None,
+                           chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    Compute risk metrics over many simulated paths in fixed-size chunks, keeping
+    only running aggregates so peak memory is bounded by chunk_size * horizon.
+    With workers > 1 the chunks run on a process pool; partial aggregates are
+    merged in chunk order, so the result is identical for any worker count.
+    """
+    workers = MONTE_CARLO_WORKERS if workers is None else workers
+    chunks = _plan_chunks(num_simulations, chunk_size, seed)
+    seed_sequences = [seed_sequence for seed_sequence, _ in chunks]
+    sizes = [size for _, size in chunks]
+    count = len(chunks)
+    args = (seed_sequences, sizes, [base_temperature] * count, [volatility] * count, [horizon] * count)
+
+    def merge(partials):
+        accumulator = RiskAccumulator(*_risk_sketch_range(base_temperature, volatility, horizon))
+        for partial in partials:
+            accumulator.merge(partial)
+        return accumulator.to_metrics()
+
+    if workers > 1 and count > 1:
+        from concurrent.futures.process import BrokenProcessPool
+        # Chunks are seeded, so a run retried on a fresh pool gives the same result
+        for attempt in range(2):
+            pool = _get_process_pool(workers)
+            try:
+                return merge(pool.map(simulate_risk_chunk, *args))
+            except BrokenProcessPool:
+                # A worker process died (e.g. killed for memory); the pool cannot recover
+                logging.warning("Monte Carlo process pool broke; rebuilding it")
+                _discard_process_pool(workers, pool)
+                if attempt:
+                    raise
+    return merge(map(simulate_risk_chunk, *args))
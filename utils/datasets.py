@@ -0,0 +1,265 @@
+import base64
+import codecs
+import csv
+import hashlib
+import json
+import math
+import os
+import time
+
+import numpy as np
+
+from utils.cache import ResultCache
+from utils.series import Series
+from utils.sqlite_store import SQLiteStore
+
+INGEST_FORMATS = ('csv', 'ndjson')
+DATASET_FIELDS = ('temperature', 'gdp')
+REGION_FIELD = 'region'
+DEFAULT_REGION = 'default'
+MAX_DATASET_ROWS = int(os.environ.get('DATASET_MAX_ROWS', 5_000_000))
+# Years outside this range are rejected; it also keeps the (region, year) sort key in int64
+MIN_YEAR, MAX_YEAR = -100_000, 100_000
+# Rejected rows are counted in full, but only the first few are described
+MAX_REPORTED_ERRORS = 20
+
+class Dataset:
+    """
+    An ingested dataset: per-region temperature and GDP Series, sorted by year
+    with one value per year. `id` is a digest of the content, so uploading the
+    same rows twice yields the same dataset.
+    """
+    __slots__ = ('id', 'name', 'created', 'regions')
+
+    def __init__(self, id, name, created, regions):
+        self.id = id
+        self.name = name
+        self.created = created
+        self.regions = regions
+
+    def region(self, region=None):
+        if region is None:
+            if len(self.regions) != 1:
+                raise ValueError(f"Dataset has {len(self.regions)} regions; choose one of: "
+                                 f"{', '.join(self.regions)}")
+            region = next(iter(self.regions))
+        if region not in self.regions:
+            raise KeyError(f"Unknown region: {region}")
+        # Ingest now rejects such regions, but datasets stored earlier may hold them
+        if not len(self.regions[region][0]):
+            raise ValueError(f"Region {region} has no temperature data")
+        return self.regions[region]
+
+    def payload(self, region=None):
+        """
+        The temperatureData/economicData shape process_data expects.
+        """
+        temperature, gdp = self.region(region)
+        return {'temperatureData': temperature.to_records(), 'economicData': gdp.to_records()}
+
+    def summary(self):
+        regions = {}
+        for name, (temperature, gdp) in self.regions.items():
+            years = np.concatenate([temperature.years, gdp.years])
+            regions[name] = {
+                'temperaturePoints': len(temperature),
+                'gdpPoints': len(gdp),
+                'startYear': int(years.min()) if len(years) else None,
+                'endYear': int(years.max()) if len(years) else None,
+            }
+        return {'datasetId': self.id, 'name': self.name, 'created': self.created, 'regions': regions}
+
+def read_rows(lines, format_type):
+    """
+    Yield (line number, row dict or None) from an iterable of text lines.
+    Unparseable NDJSON lines are yielded as None so they can be reported.
+    """
+    if format_type == 'csv':
+        reader = csv.DictReader(lines)
+        for row in reader:
+            yield reader.line_num, row
+    elif format_type == 'ndjson':
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                row = None
+            yield number, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f"Unsupported ingest format: {format_type}")
+
+def _number(value):
+    if value is None or value == '':
+        return math.nan
+    number = float(value)
+    if not math.isfinite(number):
+        raise ValueError("value is not finite")
+    return number
+
+def _no_valid_rows(errors):
+    if not errors:
+        return "No valid rows"
+    first = errors[0]
+    where = f"line {first['line']}" if 'line' in first else f"region {first['region']}"
+    return f"No valid rows (first error on {where}: {first['error']})"
+
+def ingest_rows(rows, name=None):
+    """
+    Validate (line number, row) pairs in one pass and build a Dataset.
+    Each row needs an integer 'year' and a numeric 'temperature' and/or 'gdp'; an
+    optional 'region' column splits the rows into separate series, and regions
+    without any temperature rows are rejected. Rows are sorted
+    by year and, when a (region, year) repeats, the last row wins.
+    Returns (dataset, report); raises ValueError when no row is valid.
+    """
+    region_codes = {}
+    codes, years, temperatures, gdps = [], [], [], []
+    rejected = 0
+    errors = []
+    for number, row in rows:
+        try:
+            if row is None:
+                raise ValueError("not a JSON object")
+            try:
+                year = float(row['year'])
+            except (TypeError, ValueError):
+                raise ValueError("year must be an integer") from None
+            if not year.is_integer():
+                raise ValueError("year must be an integer")
+            if not MIN_YEAR <= year <= MAX_YEAR:
+                raise ValueError(f"year must be between {MIN_YEAR} and {MAX_YEAR}")
+            temperature = _number(row.get('temperature'))
+            gdp = _number(row.get('gdp'))
+            if math.isnan(temperature) and math.isnan(gdp):
+                raise ValueError("row has neither temperature nor gdp")
+        except (KeyError, TypeError, ValueError) as e:
+            rejected += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                reason = "missing year" if isinstance(e, KeyError) else str(e)
+                errors.append({'line': number, 'error': reason})
+            continue
+        region = str(row.get(REGION_FIELD) or DEFAULT_REGION)
+        codes.append(region_codes.setdefault(region, len(region_codes)))
+        years.append(int(year))
+        temperatures.append(temperature)
+        gdps.append(gdp)
+        if len(years) > MAX_DATASET_ROWS:
+            raise ValueError(f"Datasets are limited to {MAX_DATASET_ROWS:,} rows")
+    if not years:
+        raise ValueError(_no_valid_rows(errors))
+
+    codes = np.array(codes, dtype=np.int64)
+    years = np.array(years, dtype=np.int64)
+    temperatures = np.array(temperatures)
+    gdps = np.array(gdps)
+
+    # One stable sort on a combined (region, year) key; the last row of each run wins
+    span = int(years.max() - years.min()) + 1
+    order = np.argsort(codes * span + (years - years.min()), kind='stable')
+    codes, years, temperatures, gdps = codes[order], years[order], temperatures[order], gdps[order]
+    last = np.append((codes[1:] != codes[:-1]) | (years[1:] != years[:-1]), True)
+    codes, years, temperatures, gdps = codes[last], years[last], temperatures[last], gdps[last]
+
+    regions = {}
+    dropped = 0
+    bounds = np.searchsorted(codes, np.arange(len(region_codes) + 1))
+    for region, code in region_codes.items():
+        part = slice(bounds[code], bounds[code + 1])
+        region_temperatures, region_gdps = temperatures[part], gdps[part]
+        has_temperature, has_gdp = ~np.isnan(region_temperatures), ~np.isnan(region_gdps)
+        region_years = years[part]
+        # The pipeline projects from the temperature trend, so GDP alone is not usable
+        if not has_temperature.any():
+            dropped += len(region_years)
+            rejected += len(region_years)
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'region': region, 'error': "region has no temperature data"})
+            continue
+        regions[region] = (Series(region_years[has_temperature], region_temperatures[has_temperature], 'temperature'),
+                           Series(region_years[has_gdp], region_gdps[has_gdp], 'gdp'))
+    if not regions:
+        raise ValueError(_no_valid_rows(errors))
+
+    digest = hashlib.sha256()
+    for region, (temperature, gdp) in regions.items():
+        digest.update(region.encode('utf-8') + b'\0')
+        for series in (temperature, gdp):
+            digest.update(series.years.tobytes())
+            digest.update(series.values.tobytes())
+    dataset = Dataset(digest.hexdigest()[:16], name, time.time(), regions)
+    report = {'rows': len(years) - dropped, 'duplicates': int((~last).sum()), 'rejected': rejected, 'errors': errors}
+    return dataset, report
+
+def ingest_stream(stream, format_type, name=None, encoding='utf-8'):
+    """
+    Ingest an uploaded binary stream (CSV or NDJSON) line by line.
+    """
+    return ingest_rows(read_rows(codecs.iterdecode(stream, encoding), format_type), name)
+
+def _pack(array):
+    # Raw little-endian bytes in base64: much faster to store and load than JSON number lists
+    return base64.b64encode(array.astype(array.dtype.newbyteorder('<'), copy=False).tobytes()).decode('ascii')
+
+def _unpack(text, dtype):
+    return np.frombuffer(base64.b64decode(text), dtype=np.dtype(dtype).newbyteorder('<')).astype(dtype)
+
+def encode_dataset(dataset):
+    return {
+        'id': dataset.id,
+        'name': dataset.name,
+        'created': dataset.created,
+        'regions': {
+            region: {series.field: {'years': _pack(series.years), 'values': _pack(series.values)}
+                     for series in pair}
+            for region, pair in dataset.regions.items()
+        }
+    }
+
+def decode_dataset(payload):
+    regions = {}
+    for region, fields in payload['regions'].items():
+        regions[region] = tuple(
+            Series(_unpack(fields[field]['years'], np.int64), _unpack(fields[field]['values'], float), field)
+            for field in DATASET_FIELDS
+        )
+    return Dataset(payload['id'], payload['name'], payload['created'], regions)
+
+class DatasetStore:
+    """
+    Ingested datasets in a SQLite table, keyed by dataset ID, with the most
+    recently used ones kept decoded in memory.
+    """
+
+    def __init__(self, path, ttl=None, max_entries=None, cache_size=8):
+        self.store = SQLiteStore(path, table='datasets', ttl=ttl, max_entries=max_entries)
+        self.cache = ResultCache(maxsize=cache_size, ttl=None)
+
+    def save(self, dataset):
+        self.store.set(dataset.id, encode_dataset(dataset))
+        self.cache.set(dataset.id, dataset)
+        return dataset.id
+
+    def load(self, dataset_id):
+        dataset = self.cache.get(dataset_id)
+        if dataset is None:
+            payload = self.store.get(dataset_id)
+            if payload is None:
+                return None
+            dataset = decode_dataset(payload)
+            self.cache.set(dataset_id, dataset)
+        return dataset
+
+    def delete(self, dataset_id):
+        self.cache.delete(dataset_id)
+        self.store.delete(dataset_id)
+
+def create_dataset_store(instance_path):
+    """
+    Build the dataset store from DATASET_DB_PATH, DATASET_TTL and DATASET_MAX_ENTRIES.
+    """
+    path = os.environ.get('DATASET_DB_PATH', os.path.join(instance_path, 'datasets.db'))
+    ttl = os.environ.get('DATASET_TTL')
+    max_entries = int(os.environ.get('DATASET_MAX_ENTRIES', 100))
+    return DatasetStore(path, ttl=float(ttl) if ttl else None, max_entries=max_entries)
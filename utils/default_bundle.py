@@ -0,0 +1,43 @@
+import gzip
+import hashlib
+import json
+import threading
+
+from utils.data_processor import load_default_data
+from utils.pipeline import run_pipeline
+
+# Fixed seed so every worker and restart builds byte-identical output (and ETag)
+DEFAULT_BUNDLE_SEED = 0
+DEFAULT_FIELDS = ('temperatureData', 'economicData', 'riskMetrics', 'scenarioData', 'sensitivityData')
+
+class DefaultBundle:
+    """
+    The processed default dataset, encoded once: compact JSON bytes, a gzipped
+    copy, and a strong ETag for each. The two are different representations, so
+    they need different strong validators.
+    """
+    __slots__ = ('body', 'gzip_body', 'etag', 'gzip_etag')
+
+    def __init__(self, payload):
+        self.body = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode('utf-8')
+        self.gzip_body = gzip.compress(self.body, mtime=0)
+        self.etag = hashlib.sha256(self.body).hexdigest()[:32]
+        self.gzip_etag = self.etag + '-gz'
+
+def build_default_bundle():
+    result = run_pipeline(load_default_data(), seed=DEFAULT_BUNDLE_SEED)
+    return DefaultBundle({field: result.get(field, {}) for field in DEFAULT_FIELDS})
+
+_bundle = None
+_bundle_lock = threading.Lock()
+
+def get_default_bundle():
+    """
+    Return the shared DefaultBundle, running the pipeline on first use only.
+    """
+    global _bundle
+    if _bundle is None:
+        with _bundle_lock:
+            if _bundle is None:
+                _bundle = build_default_bundle()
+    return _bundle
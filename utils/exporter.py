@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+import zlib
+
+# Rows serialized per yielded chunk; bounds the memory held by an export stream
+ROWS_PER_CHUNK = 1000
+JSON_CHUNK_BYTES = 64 * 1024
+
+EXPORT_FORMATS = {
+    'json': ('application/json', 'json'),
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', 'arrows'),
+}
+
+def collect_header(rows):
+    # Union of keys in first-seen order, so column order is stable between exports
+    header = {}
+    for row in rows:
+        for key in row:
+            header.setdefault(key, None)
+    return list(header)
+
+def _require_rows(data, format_type):
+    if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+        raise ValueError(f"{format_type} export needs a list of records")
+
+def _batches(rows):
+    for start in range(0, len(rows), ROWS_PER_CHUNK):
+        yield rows[start:start + ROWS_PER_CHUNK]
+
+def iter_csv(rows):
+    _require_rows(rows, 'csv')
+    header = collect_header(rows)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(header)
+    for batch in _batches(rows):
+        writer.writerows([row.get(column, '') for column in header] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def iter_ndjson(rows):
+    _require_rows(rows, 'ndjson')
+    encoder = json.JSONEncoder(separators=(',', ':'), default=float)
+    for batch in _batches(rows):
+        yield ''.join(encoder.encode(row) + '\n' for row in batch)
+
+def iter_json(data):
+    # iterencode yields many tiny fragments; regroup them into larger chunks
+    encoder = json.JSONEncoder(separators=(',', ':'), default=float)
+    parts = []
+    size = 0
+    for fragment in encoder.iterencode(data):
+        parts.append(fragment)
+        size += len(fragment)
+        if size >= JSON_CHUNK_BYTES:
+            yield ''.join(parts)
+            parts = []
+            size = 0
+    if parts:
+        yield ''.join(parts)
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ValueError("Parquet and Arrow exports require the pyarrow package") from None
+    return pyarrow
+
+class _Sink(io.RawIOBase):
+    # Write target for pyarrow writers that hands bytes back to the generator
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self.chunks)
+        self.chunks = []
+        return data
+
+def iter_columnar(rows, format_type):
+    """
+    Stream records as Parquet (one row group per chunk) or an Arrow IPC stream.
+    """
+    _require_rows(rows, format_type)
+    pa = _pyarrow()
+    header = collect_header(rows)
+    sink = _Sink()
+    writer = None
+    for batch in _batches(rows):
+        table = pa.Table.from_pylist([{column: row.get(column) for column in header} for row in batch])
+        if writer is None:
+            if format_type == 'parquet':
+                import pyarrow.parquet as pq
+                writer = pq.ParquetWriter(pa.PythonFile(sink, mode='w'), table.schema)
+            else:
+                writer = pa.ipc.new_stream(pa.PythonFile(sink, mode='w'), table.schema)
+        writer.write_table(table.cast(writer.schema) if format_type == 'parquet' else table)
+        data = sink.drain()
+        if data:
+            yield data
+    if writer is not None:
+        writer.close()
+    data = sink.drain()
+    if data:
+        yield data
+
+def gzip_chunks(chunks):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31)  # wbits 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode('utf-8') if isinstance(chunk, str) else chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+def iter_export(data, format_type, compress=False):
+    """
+    Yield an export of `data` chunk by chunk. CSV/NDJSON/Parquet/Arrow take a list of
+    records; JSON takes any JSON value. With compress=True the stream is gzipped.
+    """
+    if format_type == 'json':
+        chunks = iter_json(data)
+    elif format_type == 'csv':
+        chunks = iter_csv(data)
+    elif format_type == 'ndjson':
+        chunks = iter_ndjson(data)
+    elif format_type in ('parquet', 'arrow'):
+        chunks = iter_columnar(data, format_type)
+    else:
+        raise ValueError(f"Unsupported format: {format_type}")
+    return gzip_chunks(chunks) if compress else chunks
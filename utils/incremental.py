@@ -0,0 +1,190 @@
+import os
+import threading
+
+import numpy as np
+
+from utils.cache import ResultCache, cached
+from utils.data_processor import (LinearTrend, calculate_economic_impact, calculate_risk_metrics,
+                                  monte_carlo_simulation, simulate_risk, analyze_data, load_default_data,
+                                  RESULT_CACHE, DEFAULT_NUM_SIMULATIONS, DEFAULT_HORIZON, DEFAULT_CHUNK_SIZE)
+from utils.metrics import timed
+from utils.series import Series
+
+# Rebuild the running sums from scratch after this many incremental updates, so
+# floating-point drift from repeated add/remove cannot accumulate
+REFIT_INTERVAL = 1000
+# Past this share of changed points a full rebuild is cheaper than patching
+REBUILD_FRACTION = 0.5
+
+# Per-dataset trend state; the key is chosen by the caller (dataset ID, session ID, ...)
+INCREMENTAL_STATES = ResultCache(maxsize=int(os.environ.get('INCREMENTAL_CACHE_SIZE', 256)),
+                                 ttl=float(os.environ.get('INCREMENTAL_CACHE_TTL', 3600)))
+
+class TrendStats:
+    """
+    Running sufficient statistics (n, Σx, Σy, Σxy, Σx², Σy²) of a least-squares
+    line. Points can be added or removed in O(1); fit() turns the sums into a
+    LinearTrend. Sums are kept about a fixed origin so they stay well conditioned.
+    """
+    __slots__ = ('x0', 'y0', 'n', 'sx', 'sy', 'sxy', 'sxx', 'syy')
+
+    def __init__(self, x0=0.0, y0=0.0):
+        self.x0 = float(x0)
+        self.y0 = float(y0)
+        self.n = 0
+        self.sx = self.sy = self.sxy = self.sxx = self.syy = 0.0
+
+    @classmethod
+    def from_arrays(cls, years, values):
+        years = np.asarray(years, dtype=float)
+        values = np.asarray(values, dtype=float)
+        stats = cls(years[0], values[0]) if len(years) else cls()
+        stats.add_many(years, values)
+        return stats
+
+    def add_many(self, years, values, sign=1):
+        x = np.asarray(years, dtype=float) - self.x0
+        y = np.asarray(values, dtype=float) - self.y0
+        self.n += sign * len(x)
+        self.sx += sign * float(x.sum())
+        self.sy += sign * float(y.sum())
+        self.sxy += sign * float(x @ y)
+        self.sxx += sign * float(x @ x)
+        self.syy += sign * float(y @ y)
+
+    def add(self, year, value, sign=1):
+        x = float(year) - self.x0
+        y = float(value) - self.y0
+        self.n += sign
+        self.sx += sign * x
+        self.sy += sign * y
+        self.sxy += sign * x * y
+        self.sxx += sign * x * x
+        self.syy += sign * y * y
+
+    def remove(self, year, value):
+        self.add(year, value, -1)
+
+    def fit(self):
+        if self.n <= 0:
+            raise ValueError("no points to fit")
+        model = LinearTrend()
+        x_mean = self.sx / self.n
+        y_mean = self.sy / self.n
+        sxx = max(self.sxx - self.sx * x_mean, 0.0)
+        sxy = self.sxy - self.sx * y_mean
+        syy = max(self.syy - self.sy * y_mean, 0.0)
+        model.n = self.n
+        model.x_mean = x_mean + self.x0
+        model.sxx = sxx
+        model.slope = sxy / sxx if sxx > 0 else 0.0
+        model.intercept = y_mean + self.y0 - model.slope * model.x_mean
+        residual = max(syy - model.slope * sxy, 0.0)
+        model.residual_std = float(np.sqrt(residual / (self.n - 2))) if self.n > 2 else 0.0
+        return model
+
+class IncrementalTrend:
+    """
+    The last series seen for one dataset plus its TrendStats. sync() diffs a newly
+    posted series against it: appended, dropped or edited points are patched into
+    the sums in O(1) each, and anything else (years reordered, most points
+    changed) falls back to a full rebuild.
+    """
+
+    def __init__(self, series):
+        self.lock = threading.Lock()
+        self._rebuild(series)
+
+    def _rebuild(self, series):
+        self.years = series.years.copy()
+        self.values = series.values.copy()
+        self.stats = TrendStats.from_arrays(self.years, self.values)
+        self.updates = 0
+
+    def sync(self, series):
+        """
+        Bring the state up to date with `series`; returns the number of points
+        patched, or None if the state was rebuilt.
+        """
+        old_years, old_values = self.years, self.values
+        new_years, new_values = series.years, series.values
+        common = min(len(old_years), len(new_years))
+        if not common or (old_years[:common] != new_years[:common]).any():
+            self._rebuild(series)
+            return None
+        edited = np.flatnonzero(old_values[:common] != new_values[:common])
+        changes = len(edited) + abs(len(new_years) - len(old_years))
+        if changes > REBUILD_FRACTION * len(new_years) or self.updates + changes > REFIT_INTERVAL:
+            self._rebuild(series)
+            return None
+
+        stats = self.stats
+        for index in edited.tolist():
+            stats.remove(old_years[index], old_values[index])
+            stats.add(new_years[index], new_values[index])
+        if len(new_years) > common:
+            stats.add_many(new_years[common:], new_values[common:])
+        elif len(old_years) > common:
+            stats.add_many(old_years[common:], old_values[common:], sign=-1)
+        self.years = new_years.copy()
+        self.values = new_values.copy()
+        self.updates += changes
+        return changes
+
+@cached(RESULT_CACHE, lambda num_simulations, horizon, seed: ('zero-base-risk', num_simulations, horizon, seed))
+def _zero_base_risk(num_simulations, horizon, seed):
+    # Risk metrics of paths started at 0. Paths are base + noise, and mean,
+    # percentile and max all shift with the base, so any base is an addition away.
+    return calculate_risk_metrics(monte_carlo_simulation(num_simulations, 0.0, volatility=0.1,
+                                                         horizon=horizon, seed=seed))
+
+def incremental_analyze(key, data, num_simulations=DEFAULT_NUM_SIMULATIONS, horizon=DEFAULT_HORIZON, seed=None,
+                        risk_mode='exact', chunk_size=DEFAULT_CHUNK_SIZE, workers=None):
+    """
+    Drop-in for analyze_data that reuses the trend state stored under `key`.
+    Only the fit update, the projected years and their impacts are recomputed;
+    with a seed, risk metrics are the cached zero-base metrics shifted by the
+    new base temperature instead of a fresh Monte Carlo run. The streaming risk
+    mode always takes the full analyze_data path.
+    """
+    if risk_mode != 'exact':
+        return analyze_data(data, num_simulations, horizon, seed, risk_mode, chunk_size, workers)
+    if not data:
+        data = load_default_data()
+    temperature_data = data.get('temperatureData', [])
+    economic_data = data.get('economicData', [])
+    temperature = Series.from_records(temperature_data, 'temperature')
+    if not len(temperature):
+        raise ValueError("temperatureData must not be empty")
+
+    with timed('regression'):
+        state = INCREMENTAL_STATES.get(key)
+        if state is None:
+            state = IncrementalTrend(temperature)
+            INCREMENTAL_STATES.set(key, state)
+            model = state.stats.fit()
+        else:
+            with state.lock:
+                state.sync(temperature)
+                model = state.stats.fit()
+        last_year = int(temperature.years.max())
+        future_years = np.arange(last_year + 1, last_year + horizon + 1)
+        predicted = model.predict(future_years)
+    base_temperature = float(temperature.values[-1])
+    impacts = calculate_economic_impact(predicted - base_temperature)
+    future_temperature = Series(future_years, predicted, 'temperature')
+
+    if seed is None:
+        # simulate_risk records its own monte_carlo stage
+        risk_metrics = simulate_risk(base_temperature, num_simulations, horizon, seed)
+    else:
+        with timed('monte_carlo'):
+            risk_metrics = {metric: value + base_temperature
+                            for metric, value in _zero_base_risk(num_simulations, horizon, seed).items()}
+
+    result = {
+        "temperatureData": temperature_data + future_temperature.to_records(),
+        "economicData": economic_data + Series(future_years, impacts, 'gdp').to_records(),
+        "riskMetrics": risk_metrics
+    }
+    return result, temperature.concat(future_temperature)
@@ -0,0 +1,81 @@
+import os
+
+from utils.cache import ResultCache, canonical_hash
+from utils.nlg import generate_chart_summary
+
+# Upper bound on the tokens spent on dataset context in each LLM prompt
+CONTEXT_TOKEN_BUDGET = int(os.environ.get('LLM_CONTEXT_TOKENS', 256))
+# Conservative characters-per-token ratio; real tokenizers average closer to 4
+CHARS_PER_TOKEN = 3
+
+CONTEXT_CACHE = ResultCache(maxsize=256, ttl=3600)
+
+RISK_LABELS = (('mean_temperature', 'mean'), ('var_95', 'VaR 95'), ('max_temperature', 'max'))
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+def _summary_lines(data):
+    try:
+        summary = generate_chart_summary(data)
+    except (KeyError, IndexError, TypeError, ZeroDivisionError):
+        # Partial or degenerate series; fall back to the other sections
+        return []
+    return [line for line in summary.splitlines()[1:] if line.strip()]
+
+def _scenario_lines(scenarios):
+    baseline = scenarios.get('baseline')
+    if not baseline:
+        return []
+    final_year = baseline[-1]['year']
+    baseline_final = baseline[-1]['temperature']
+    lines = []
+    for name, series in scenarios.items():
+        if name == 'baseline' or not series:
+            continue
+        delta = series[-1]['temperature'] - baseline_final
+        lines.append(f"Scenario {name}: {delta:+.2f}°C versus baseline by {final_year}.")
+    return lines
+
+def _digest(data):
+    lines = _summary_lines(data)
+    risk = data.get('riskMetrics') or {}
+    if not any(line.startswith('Risk Assessment') for line in lines):
+        # Report whichever metrics are present; a partial set must not drop the other sections
+        parts = [f"{label} {risk[metric]:.2f}°C" for metric, label in RISK_LABELS if risk.get(metric) is not None]
+        if parts:
+            lines.append(f"Risk: {', '.join(parts)}.")
+    lines += _scenario_lines(data.get('scenarioData') or {})
+    return lines
+
+def _fit_budget(lines, token_budget):
+    # Keep whole lines in priority order; cut the first line that does not fit
+    kept = []
+    used = 0
+    for line in lines:
+        cost = estimate_tokens(line + '\n')
+        if used + cost > token_budget:
+            remaining = (token_budget - used) * CHARS_PER_TOKEN - 1
+            if remaining > 20:
+                kept.append(line[:remaining - 3] + '...')
+            break
+        kept.append(line)
+        used += cost
+    return '\n'.join(kept)
+
+def build_context(data, token_budget=CONTEXT_TOKEN_BUDGET):
+    """
+    Build a short digest of the user's projections (trends, risk metrics and
+    scenario deltas) for grounding LLM answers. The digest never exceeds
+    token_budget estimated tokens, whatever the series length, and is cached
+    per dataset hash.
+    """
+    if not data or token_budget <= 0:
+        return ''
+    key = canonical_hash('llm_context', data.get('temperatureData'), data.get('economicData'),
+                         data.get('riskMetrics'), data.get('scenarioData'), token_budget)
+    context = CONTEXT_CACHE.get(key)
+    if context is None:
+        context = _fit_budget(_digest(data), token_budget)
+        CONTEXT_CACHE.set(key, context)
+    return context
@@ -1,25 +1,263 @@
+import logging
 import os
-from groq import Groq
+import threading
+import time
 
-client = Groq(api_key=os.environ.get("GROQ_API_KEY"))
+from utils.cache import ResultCache, canonical_hash
+from utils.llm_simulator import simulate_llm_response, simulate_llm_stream
+from utils.metrics import timed, observe, LLM_TTFT_METRIC
 
-def get_llm_response(query):
+SYSTEM_PROMPT = "You are a helpful assistant specializing in climate economic modeling."
+FALLBACK_RESPONSE = ("I apologize, but I'm having trouble processing your request at the moment. "
+                     "Please try again later.")
+
+LLM_MODEL = os.environ.get('LLM_MODEL', 'mixtral-8x7b-32768')
+LLM_MAX_TOKENS = int(os.environ.get('LLM_MAX_TOKENS', 1024))
+LLM_TIMEOUT = float(os.environ.get('LLM_TIMEOUT', 30))
+# Queries allowed in flight per process, and how long a caller waits for a slot
+LLM_MAX_CONCURRENCY = int(os.environ.get('LLM_MAX_CONCURRENCY', 8))
+LLM_QUEUE_TIMEOUT = float(os.environ.get('LLM_QUEUE_TIMEOUT', 5))
+LLM_MAX_CONNECTIONS = int(os.environ.get('LLM_MAX_CONNECTIONS', 20))
+
+# Answers to previously seen (normalized) prompts
+RESPONSE_CACHE = ResultCache(maxsize=int(os.environ.get('LLM_CACHE_SIZE', 512)),
+                             ttl=float(os.environ.get('LLM_CACHE_TTL', 3600)))
+
+class LLMBusyError(RuntimeError):
+    """Raised when no concurrency slot frees up within LLM_QUEUE_TIMEOUT."""
+
+def normalize_prompt(query):
+    # Case and whitespace differences should not defeat the response cache
+    return ' '.join(query.split()).casefold()
+
+def _messages(query, context=''):
+    messages = [
+        {
+            "role": "system",
+            "content": SYSTEM_PROMPT,
+        }
+    ]
+    if context:
+        messages.append({
+            "role": "system",
+            "content": f"Summary of the user's current climate-economic data:\n{context}",
+        })
+    messages.append({
+        "role": "user",
+        "content": query,
+    })
+    return messages
+
+class LLMClient:
+    """
+    Chat-completion client with pooled HTTP connections, timeouts, a concurrency
+    limit and a response cache. The 'simulator' backend answers offline through
+    utils.llm_simulator; the Groq SDK is only imported for the 'groq' backend.
+    """
+
+    def __init__(self, backend, model=LLM_MODEL, timeout=LLM_TIMEOUT, max_concurrency=LLM_MAX_CONCURRENCY,
+                 max_connections=LLM_MAX_CONNECTIONS, cache=RESPONSE_CACHE):
+        self.backend = backend
+        self.model = model
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.max_connections = max_connections
+        self.cache = cache
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._sync_client = None
+        # Per event loop: an asyncio semaphore and AsyncGroq client are bound to the
+        # loop they are first used on, so each loop gets its own (see _loop_state)
+        self._loop_states = {}
+        self._lock = threading.Lock()
+
+    def _limits(self):
+        import httpx
+        return httpx.Limits(max_connections=self.max_connections, max_keepalive_connections=self.max_connections)
+
+    def _groq(self):
+        with self._lock:
+            if self._sync_client is None:
+                import httpx
+                from groq import Groq
+                self._sync_client = Groq(api_key=os.environ.get("GROQ_API_KEY"), timeout=self.timeout,
+                                         http_client=httpx.Client(limits=self._limits(), timeout=self.timeout))
+            return self._sync_client
+
+    def _loop_state(self):
+        # asyncio.run() creates a fresh loop per call, so one process can see many
+        # loops; each gets its own semaphore (max_concurrency applies per loop) and
+        # client. The bound semaphore refers back to its loop, so a weak mapping
+        # would never let go; states of closed loops are pruned here instead.
+        import asyncio
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for closed in [other for other in self._loop_states if other.is_closed()]:
+                del self._loop_states[closed]
+            state = self._loop_states.get(loop)
+            if state is None:
+                state = self._loop_states[loop] = {'slots': asyncio.Semaphore(self.max_concurrency), 'client': None}
+            return state
+
+    def _async_groq(self, state):
+        with self._lock:
+            if state['client'] is None:
+                import httpx
+                from groq import AsyncGroq
+                state['client'] = AsyncGroq(api_key=os.environ.get("GROQ_API_KEY"), timeout=self.timeout,
+                                            http_client=httpx.AsyncClient(limits=self._limits(),
+                                                                          timeout=self.timeout))
+            return state['client']
+
+    def _cache_key(self, query, context):
+        return canonical_hash('llm', self.backend, self.model, normalize_prompt(query), context)
+
+    def complete(self, query, context=''):
+        key = self._cache_key(query, context)
+        cached_response = self.cache.get(key)
+        if cached_response is not None:
+            return cached_response
+
+        if not self._slots.acquire(timeout=LLM_QUEUE_TIMEOUT):
+            raise LLMBusyError("Too many LLM queries in flight")
+        try:
+            with timed('llm_call'):
+                if self.backend == 'simulator':
+                    response = simulate_llm_response(query)
+                else:
+                    chat_completion = self._groq().chat.completions.create(
+                        messages=_messages(query, context),
+                        model=self.model,
+                        max_tokens=LLM_MAX_TOKENS,
+                    )
+                    response = chat_completion.choices[0].message.content
+        finally:
+            self._slots.release()
+
+        self.cache.set(key, response)
+        return response
+
+    async def acomplete(self, query, context=''):
+        # Only async callers need asyncio, and by then their event loop has imported it
+        import asyncio
+        key = self._cache_key(query, context)
+        cached_response = self.cache.get(key)
+        if cached_response is not None:
+            return cached_response
+
+        state = self._loop_state()
+        try:
+            await asyncio.wait_for(state['slots'].acquire(), LLM_QUEUE_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise LLMBusyError("Too many LLM queries in flight") from None
+        try:
+            with timed('llm_call'):
+                if self.backend == 'simulator':
+                    response = simulate_llm_response(query)
+                else:
+                    chat_completion = await self._async_groq(state).chat.completions.create(
+                        messages=_messages(query, context),
+                        model=self.model,
+                        max_tokens=LLM_MAX_TOKENS,
+                    )
+                    response = chat_completion.choices[0].message.content
+        finally:
+            state['slots'].release()
+
+        self.cache.set(key, response)
+        return response
+
+    def stream(self, query, context=''):
+        """
+        Yield the response in chunks as the model produces them. The complete text
+        is cached, so a repeated question is answered in a single chunk.
+        """
+        key = self._cache_key(query, context)
+        cached_response = self.cache.get(key)
+        if cached_response is not None:
+            yield cached_response
+            return
+
+        if not self._slots.acquire(timeout=LLM_QUEUE_TIMEOUT):
+            raise LLMBusyError("Too many LLM queries in flight")
+        try:
+            start = time.perf_counter()
+            if self.backend == 'simulator':
+                chunks = simulate_llm_stream(query)
+            else:
+                completion = self._groq().chat.completions.create(
+                    messages=_messages(query, context),
+                    model=self.model,
+                    max_tokens=LLM_MAX_TOKENS,
+                    stream=True,
+                )
+                chunks = (chunk.choices[0].delta.content for chunk in completion if chunk.choices)
+
+            parts = []
+            with timed('llm_stream'):
+                for chunk in chunks:
+                    if not chunk:
+                        continue
+                    if not parts:
+                        observe(LLM_TTFT_METRIC, time.perf_counter() - start, backend=self.backend)
+                    parts.append(chunk)
+                    yield chunk
+        finally:
+            self._slots.release()
+
+        self.cache.set(key, ''.join(parts))
+
+_client = None
+_client_lock = threading.Lock()
+
+def get_client():
+    """
+    Return the shared LLMClient, built on first use. LLM_BACKEND selects 'groq' or
+    'simulator'; without a GROQ_API_KEY the simulator is used.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                backend = os.environ.get('LLM_BACKEND') or ('groq' if os.environ.get('GROQ_API_KEY') else 'simulator')
+                if backend not in ('groq', 'simulator'):
+                    raise ValueError(f"Unsupported LLM backend: {backend}")
+                _client = LLMClient(backend)
+    return _client
+
+def get_llm_response(query, context=''):
+    try:
+        return get_client().complete(query, context)
+    except LLMBusyError:
+        raise
+    except Exception as e:
+        logging.error("Error in LLM API call: %s", e)
+        return FALLBACK_RESPONSE
+
+def stream_llm_response(query, context=''):
+    """
+    Streaming variant of get_llm_response: yields text chunks as they arrive.
+    If the call fails part-way, the fallback message is yielded instead.
+    """
+    started = False
+    try:
+        for chunk in get_client().stream(query, context):
+            started = True
+            yield chunk
+    except LLMBusyError:
+        raise
+    except Exception as e:
+        logging.error("Error in streaming LLM API call: %s", e)
+        yield ('\n\n' if started else '') + FALLBACK_RESPONSE
+
+async def get_llm_response_async(query, context=''):
+    """
+    Async variant of get_llm_response for ASGI servers or asyncio callers, so
+    waiting on the model does not hold a worker thread.
+    """
     try:
-        chat_completion = client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a helpful assistant specializing in climate economic modeling.",
-                },
-                {
-                    "role": "user",
-                    "content": query,
-                }
-            ],
-            model="mixtral-8x7b-32768",
-            max_tokens=1024,
-        )
-        return chat_completion.choices[0].message.content
+        return await get_client().acomplete(query, context)
+    except LLMBusyError:
+        raise
     except Exception as e:
-        print(f"Error in LLM API call: {str(e)}")
-        return "I apologize, but I'm having trouble processing your request at the moment. Please try again later."
\ No newline at end of file
+        logging.error("Error in LLM API call: %s", e)
+        return FALLBACK_RESPONSE
@@ -1,4 +1,5 @@
 import random
+import time
 
 def simulate_llm_response(query):
     # Simulated LLM responses
@@ -16,3 +17,12 @@ def simulate_llm_response(query):
     ]
     
     return random.choice(responses)
+
+def simulate_llm_stream(query, words_per_chunk=3, delay=0.0):
+    # Yield a simulated response in small chunks, like a streaming completion
+    words = simulate_llm_response(query).split(' ')
+    for start in range(0, len(words), words_per_chunk):
+        if delay:
+            time.sleep(delay)
+        chunk = ' '.join(words[start:start + words_per_chunk])
+        yield chunk if start + words_per_chunk >= len(words) else chunk + ' '
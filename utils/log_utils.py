@@ -0,0 +1,58 @@
+import json
+
+MAX_SUMMARY_KEYS = 8
+MAX_SCALAR_CHARS = 40
+
+def _summarize_value(value):
+    if isinstance(value, list):
+        years = [item['year'] for item in value if isinstance(item, dict) and 'year' in item]
+        if years:
+            return f"{len(value)} items, years {min(years)}-{max(years)}"
+        return f"{len(value)} items"
+    if isinstance(value, dict):
+        return f"{{{_summarize_keys(value)}}}"
+    text = repr(value)
+    return text if len(text) <= MAX_SCALAR_CHARS else text[:MAX_SCALAR_CHARS] + '...'
+
+def _summarize_keys(mapping):
+    keys = list(mapping)
+    names = ', '.join(str(key) for key in keys[:MAX_SUMMARY_KEYS])
+    return names + (f", +{len(keys) - MAX_SUMMARY_KEYS} more" if len(keys) > MAX_SUMMARY_KEYS else '')
+
+def summarize_payload(payload):
+    """
+    Return a short, size-capped description of a payload: list lengths and year
+    ranges for series, key names for nested dicts, truncated reprs for scalars.
+    """
+    if isinstance(payload, dict):
+        items = list(payload.items())
+        parts = [f"{key}: {_summarize_value(value)}" for key, value in items[:MAX_SUMMARY_KEYS]]
+        if len(items) > MAX_SUMMARY_KEYS:
+            parts.append(f"+{len(items) - MAX_SUMMARY_KEYS} more keys")
+        return '{' + '; '.join(parts) + '}'
+    return _summarize_value(payload)
+
+class LazySummary:
+    """
+    Log argument that only builds the payload summary if the record is emitted.
+    """
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        return summarize_payload(self.payload)
+
+class LazyJSON:
+    """
+    Log argument that only serializes the full payload if the record is emitted,
+    e.g. logging.debug('Payload: %s', LazyJSON(data)).
+    """
+    __slots__ = ('payload',)
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    def __str__(self):
+        return json.dumps(self.payload, indent=2, default=str)
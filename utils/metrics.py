@@ -0,0 +1,171 @@
+import contextlib
+import functools
+import os
+import threading
+import time
+
+# Set METRICS_ENABLED=0 to turn instrumentation into no-ops
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') != '0'
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_METRIC = 'climate_stage_duration_seconds'
+REQUEST_METRIC = 'climate_request_duration_seconds'
+LLM_TTFT_METRIC = 'climate_llm_time_to_first_token_seconds'
+
+def _escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape_label(value)}"' for key, value in labels) + '}'
+
+def _format_value(value):
+    return repr(float(value)) if value != float('inf') else '+Inf'
+
+class Histogram:
+    """
+    Cumulative-bucket latency histogram in the Prometheus style.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[index] += 1
+                    break
+
+    def snapshot(self):
+        with self._lock:
+            cumulative = []
+            running = 0
+            for count in self.counts:
+                running += count
+                cumulative.append(running)
+            return cumulative, self.count, self.sum
+
+class MetricsRegistry:
+    """
+    Holds labelled histograms plus callbacks that report externally kept counters,
+    and renders everything in the Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._histograms = {}
+        self._help = {}
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def describe(self, name, help_text):
+        self._help[name] = help_text
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, Histogram())
+        histogram.observe(value)
+
+    def register_collector(self, collector):
+        """
+        Register a callable returning (name, type, help, value, labels) samples,
+        e.g. counters that already live elsewhere such as cache statistics.
+        """
+        self._collectors.append(collector)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def render(self):
+        lines = []
+        by_name = {}
+        for (name, labels), histogram in sorted(self._histograms.items()):
+            by_name.setdefault(name, []).append((labels, histogram))
+        for name, series in by_name.items():
+            lines.append(f'# HELP {name} {self._help.get(name, name)}')
+            lines.append(f'# TYPE {name} histogram')
+            for labels, histogram in series:
+                cumulative, count, total = histogram.snapshot()
+                for bound, value in zip(histogram.buckets + (float('inf'),), cumulative + [count]):
+                    bucket_labels = labels + (('le', _format_value(bound)),)
+                    lines.append(f'{name}_bucket{_format_labels(bucket_labels)} {value}')
+                lines.append(f'{name}_sum{_format_labels(labels)} {_format_value(total)}')
+                lines.append(f'{name}_count{_format_labels(labels)} {count}')
+
+        # The text format requires all samples of a family in one group, so
+        # collector samples are gathered per name before they are written
+        families = {}
+        for collector in self._collectors:
+            for name, metric_type, help_text, value, labels in collector():
+                family = families.setdefault(name, (metric_type, help_text, []))
+                family[2].append(f'{name}{_format_labels(tuple(sorted(labels.items())))} {_format_value(value)}')
+        for name, (metric_type, help_text, samples) in families.items():
+            lines.append(f'# HELP {name} {help_text}')
+            lines.append(f'# TYPE {name} {metric_type}')
+            lines.extend(samples)
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+REGISTRY.describe(STAGE_METRIC, 'Time spent in each analytics, LLM and persistence stage.')
+REGISTRY.describe(REQUEST_METRIC, 'End-to-end request latency per route.')
+REGISTRY.describe(LLM_TTFT_METRIC, 'Time from sending a streaming LLM query to receiving its first token.')
+
+class _StageTimer:
+    __slots__ = ('stage', 'start')
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        REGISTRY.observe(STAGE_METRIC, time.perf_counter() - self.start, stage=self.stage)
+        return False
+
+_NULL_TIMER = contextlib.nullcontext()
+
+def timed(stage):
+    """
+    Time a block (`with timed('monte_carlo'):`) into the per-stage histogram.
+    Returns a shared no-op context manager when metrics are disabled.
+    """
+    if not METRICS_ENABLED:
+        return _NULL_TIMER
+    return _StageTimer(stage)
+
+def timed_stage(stage):
+    """
+    Decorator form of timed(); leaves the function untouched when metrics are disabled.
+    """
+    def decorator(func):
+        if not METRICS_ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _StageTimer(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def observe_request(route, method, seconds):
+    if METRICS_ENABLED:
+        REGISTRY.observe(REQUEST_METRIC, seconds, route=route, method=method)
+
+def observe(name, seconds, **labels):
+    if METRICS_ENABLED:
+        REGISTRY.observe(name, seconds, **labels)
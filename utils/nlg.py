@@ -1,12 +1,17 @@
+from utils.series import Series
+
+def _endpoints(series, field):
+    # First and last (year, value) of a Series or a list of records
+    if isinstance(series, Series):
+        return ((int(series.years[0]), float(series.values[0])),
+                (int(series.years[-1]), float(series.values[-1])))
+    return (series[0]['year'], series[0][field]), (series[-1]['year'], series[-1][field])
+
 def generate_chart_summary(data):
     summary = "Here's a summary of the climate economic data:\n\n"
 
     if 'temperatureData' in data:
-        temp_data = data['temperatureData']
-        start_year = temp_data[0]['year']
-        end_year = temp_data[-1]['year']
-        start_temp = temp_data[0]['temperature']
-        end_temp = temp_data[-1]['temperature']
+        (start_year, start_temp), (end_year, end_temp) = _endpoints(data['temperatureData'], 'temperature')
         temp_change = end_temp - start_temp
         
         summary += f"Temperature Trends: From {start_year} to {end_year}, the temperature "
@@ -14,11 +19,7 @@ def generate_chart_summary(data):
         summary += f"from {start_temp:.2f}°C to {end_temp:.2f}°C.\n\n"
 
     if 'economicData' in data:
-        econ_data = data['economicData']
-        start_year = econ_data[0]['year']
-        end_year = econ_data[-1]['year']
-        start_gdp = econ_data[0]['gdp']
-        end_gdp = econ_data[-1]['gdp']
+        (start_year, start_gdp), (end_year, end_gdp) = _endpoints(data['economicData'], 'gdp')
         gdp_change = (end_gdp - start_gdp) / start_gdp * 100
         
         summary += f"Economic Impact: The GDP {'increased' if gdp_change > 0 else 'decreased'} "
@@ -0,0 +1,82 @@
+from utils.cache import SingleFlight, canonical_hash
+from utils.data_processor import (analyze_data, evaluate_scenarios, default_scenario_specs,
+                                  perform_sensitivity_analysis, RESULT_CACHE, DEFAULT_NUM_SIMULATIONS,
+                                  DEFAULT_HORIZON, DEFAULT_CHUNK_SIZE, RISK_MODES)
+from utils.incremental import incremental_analyze
+from utils.metrics import timed
+
+# Upper bounds for per-request simulation parameters
+MAX_SIMULATIONS = 100_000
+MAX_STREAMING_SIMULATIONS = 10_000_000
+MAX_HORIZON = 200
+
+# Identical pipeline runs that overlap in time share a single computation
+PIPELINE_FLIGHTS = SingleFlight()
+
+def get_simulation_params(data):
+    """
+    Extract Monte Carlo parameters (path count, horizon, seed, risk mode) from a
+    request payload. Raises ValueError for values outside the supported range.
+    """
+    data = data or {}
+    risk_mode = data.get('riskMode', 'exact')
+    num_simulations = int(data.get('numSimulations', DEFAULT_NUM_SIMULATIONS))
+    horizon = int(data.get('horizon', DEFAULT_HORIZON))
+    seed = data.get('seed')
+    if risk_mode not in RISK_MODES:
+        raise ValueError(f"riskMode must be one of {', '.join(RISK_MODES)}")
+    max_simulations = MAX_STREAMING_SIMULATIONS if risk_mode == 'streaming' else MAX_SIMULATIONS
+    if not 1 <= num_simulations <= max_simulations:
+        raise ValueError(f"numSimulations must be between 1 and {max_simulations}")
+    if not 1 <= horizon <= MAX_HORIZON:
+        raise ValueError(f"horizon must be between 1 and {MAX_HORIZON}")
+    if seed is not None:
+        seed = int(seed)
+        if seed < 0:
+            raise ValueError("seed must be a non-negative integer")
+    return {'num_simulations': num_simulations, 'horizon': horizon, 'seed': seed, 'risk_mode': risk_mode}
+
+def _compute_pipeline(data, incremental_key=None, **params):
+    # Scenarios are built from the columnar temperature series produced by
+    # analyze_data rather than by unpacking the processed records again.
+    if incremental_key is not None:
+        processed_data, temperature = incremental_analyze(incremental_key, data, **params)
+    else:
+        processed_data, temperature = analyze_data(data, **params)
+    with timed('scenarios'):
+        scenarios = evaluate_scenarios(temperature, default_scenario_specs())
+        scenario_data = {
+            'baseline': processed_data['temperatureData'],
+            **{name: series.to_records() for name, series in scenarios.items()}
+        }
+    # Sensitivity only depends on the latest economic data point
+    sensitivity_data = perform_sensitivity_analysis({'economicData': processed_data['economicData'][-1:]})
+
+    # Combine all results into a single response
+    return {
+        **processed_data,
+        'scenarioData': scenario_data,
+        'sensitivityData': sensitivity_data
+    }
+
+def _cached_pipeline(key, data, incremental_key=None, **params):
+    result = RESULT_CACHE.get(key)
+    if result is None:
+        result = _compute_pipeline(data, incremental_key, **params)
+        RESULT_CACHE.set(key, result)
+    return result
+
+def run_pipeline(data, num_simulations=DEFAULT_NUM_SIMULATIONS, horizon=DEFAULT_HORIZON, seed=None,
+                 risk_mode='exact', chunk_size=DEFAULT_CHUNK_SIZE, incremental_key=None):
+    """
+    Analyze the data (trend fit, projection and risk metrics), evaluate the default
+    scenarios on the resulting series, run perform_sensitivity_analysis and merge
+    the results. Results are cached, and concurrent calls with the same inputs are
+    coalesced into one run. With an incremental_key the trend fit is patched from
+    the state kept for that key (see utils.incremental) instead of refitted.
+    """
+    data = data or {}
+    params = {'num_simulations': num_simulations, 'horizon': horizon, 'seed': seed,
+              'risk_mode': risk_mode, 'chunk_size': chunk_size}
+    key = canonical_hash('pipeline', data.get('temperatureData', []), data.get('economicData', []), params)
+    return PIPELINE_FLIGHTS.do(key, _cached_pipeline, key, data, incremental_key, **params)
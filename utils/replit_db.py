@@ -1,31 +1,75 @@
 import json
+import logging
+import os
 import uuid
+from utils.metrics import timed
+from utils.sqlite_store import SQLiteStore
 
 try:
     from replit import db
     USE_REPLIT_DB = True
 except ImportError:
     USE_REPLIT_DB = False
-    print("Replit DB not available. Using in-memory storage.")
+
+DEFAULT_DB_PATH = os.path.join('instance', 'replit_db.sqlite3')
+DEFAULT_SESSION_TTL = 30 * 24 * 60 * 60
+DEFAULT_MAX_SESSIONS = 100_000
+BACKENDS = ('replit', 'sqlite', 'memory')
 
 class ReplitDB:
-    def __init__(self):
-        if not USE_REPLIT_DB:
+    """
+    Saved-session storage. Uses Replit DB when the `replit` package is available,
+    otherwise a local SQLite file; 'memory' keeps the old per-process dict.
+    save_session writes through, so a returned ID is readable from any process
+    sharing the file; bulk callers can use save_sessions to batch the writes
+    into one transaction.
+    """
+
+    def __init__(self, backend=None, path=None, ttl=None, max_sessions=None):
+        backend = backend or os.environ.get('REPLIT_DB_BACKEND') or ('replit' if USE_REPLIT_DB else 'sqlite')
+        if backend not in BACKENDS:
+            raise ValueError(f"Unsupported ReplitDB backend: {backend}")
+        if backend == 'replit' and not USE_REPLIT_DB:
+            raise ValueError("The replit package is not installed")
+        self.backend = backend
+
+        if backend == 'memory':
             self.memory_db = {}
+        elif backend == 'sqlite':
+            ttl = ttl if ttl is not None else float(os.environ.get('REPLIT_DB_TTL', DEFAULT_SESSION_TTL))
+            max_sessions = max_sessions or int(os.environ.get('REPLIT_DB_MAX_SESSIONS', DEFAULT_MAX_SESSIONS))
+            self.store = SQLiteStore(path or os.environ.get('REPLIT_DB_PATH', DEFAULT_DB_PATH),
+                                     table='saved_sessions', ttl=ttl, max_entries=max_sessions)
+        logging.info('ReplitDB using %s backend', backend)
 
     def save_session(self, session_data):
-        session_id = str(uuid.uuid4())
-        if USE_REPLIT_DB:
-            db[session_id] = json.dumps(session_data)
-        else:
-            self.memory_db[session_id] = json.dumps(session_data)
-        return session_id
+        return self.save_sessions([session_data])[0]
+
+    def save_sessions(self, sessions):
+        """
+        Save several sessions and return their IDs; on SQLite they are written in
+        a single transaction.
+        """
+        items = [(str(uuid.uuid4()), session_data) for session_data in sessions]
+        with timed('session_save'):
+            if self.backend == 'replit':
+                for session_id, session_data in items:
+                    db[session_id] = json.dumps(session_data)
+            elif self.backend == 'memory':
+                for session_id, session_data in items:
+                    self.memory_db[session_id] = json.dumps(session_data)
+            else:
+                self.store.set_many(items)
+        return [session_id for session_id, _ in items]
 
     def load_session(self, session_id):
-        if USE_REPLIT_DB:
-            if session_id in db:
-                return json.loads(db[session_id])
-        else:
-            if session_id in self.memory_db:
-                return json.loads(self.memory_db[session_id])
+        with timed('session_load'):
+            if self.backend == 'replit':
+                if session_id in db:
+                    return json.loads(db[session_id])
+            elif self.backend == 'memory':
+                if session_id in self.memory_db:
+                    return json.loads(self.memory_db[session_id])
+            else:
+                return self.store.get(session_id)
         return None
@@ -0,0 +1,95 @@
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from utils.cache import ResultCache
+from utils.metrics import timed
+from utils.sqlite_store import SQLiteStore
+
+REPORT_WORKERS = int(os.environ.get('REPORT_WORKERS', 2))
+# How long the synchronous /generate_report route waits for a render before answering 202
+REPORT_WAIT_TIMEOUT = float(os.environ.get('REPORT_WAIT_TIMEOUT', 30))
+
+class ReportQueue:
+    """
+    Renders reports on a local thread pool and keeps finished artifacts in a
+    SQLiteStore. The job ID is the artifact key (a hash of the dataset and report
+    parameters), so identical requests share one render and, once it is stored,
+    are answered from the artifact without rendering again. Status checks use
+    the store's exists() query and never decode the artifact.
+    """
+
+    def __init__(self, store, workers=REPORT_WORKERS):
+        self.store = store
+        self.workers = workers
+        self._executor = None
+        self._running = {}
+        self._failed = ResultCache(maxsize=256, ttl=3600)
+        self._lock = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='report')
+        return self._executor
+
+    def submit(self, job_id, render, *args, **kwargs):
+        """
+        Queue render(*args, **kwargs) under job_id unless its artifact already
+        exists or it is already queued. Returns the job status.
+        """
+        if self.store.exists(job_id):
+            return 'done'
+        with self._lock:
+            if job_id not in self._running:
+                self._failed.delete(job_id)
+                self._running[job_id] = self._pool().submit(self._run, job_id, render, args, kwargs)
+        return self.status(job_id)['status']
+
+    def _run(self, job_id, render, args, kwargs):
+        try:
+            with timed('report_render'):
+                html = render(*args, **kwargs)
+            self.store.set(job_id, html)
+        except Exception as e:
+            logging.error("Report job %s failed: %s", job_id, e, exc_info=True)
+            self._failed.set(job_id, e.__class__.__name__)
+        finally:
+            with self._lock:
+                self._running.pop(job_id, None)
+
+    def status(self, job_id):
+        """
+        {'jobId', 'status'} where status is queued, running, done or failed (with
+        'errorType'); 'unknown' for IDs that were never submitted or have expired.
+        """
+        future = self._running.get(job_id)
+        if future is not None:
+            return {'jobId': job_id, 'status': 'running' if future.running() else 'queued'}
+        if self.store.exists(job_id):
+            return {'jobId': job_id, 'status': 'done'}
+        error_type = self._failed.get(job_id)
+        if error_type is not None:
+            return {'jobId': job_id, 'status': 'failed', 'errorType': error_type}
+        return {'jobId': job_id, 'status': 'unknown'}
+
+    def result(self, job_id):
+        return self.store.get(job_id)
+
+    def wait(self, job_id, timeout=REPORT_WAIT_TIMEOUT):
+        """
+        Block until the job finishes or the timeout passes; returns the artifact or None.
+        """
+        future = self._running.get(job_id)
+        if future is not None:
+            wait([future], timeout)
+        return self.result(job_id)
+
+def create_report_queue(instance_path):
+    """
+    Report queue backed by SQLite (REPORT_DB_PATH, REPORT_TTL, REPORT_MAX_ENTRIES).
+    """
+    path = os.environ.get('REPORT_DB_PATH', os.path.join(instance_path, 'reports.db'))
+    store = SQLiteStore(path, table='reports', ttl=float(os.environ.get('REPORT_TTL', 86400)),
+                        max_entries=int(os.environ.get('REPORT_MAX_ENTRIES', 500)))
+    return ReportQueue(store)
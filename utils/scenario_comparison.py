@@ -1,11 +1,92 @@
-def compare_scenarios(scenarios):
-    comparison = []
-    scenario_names = list(scenarios.keys())
-    
-    for year in scenarios[scenario_names[0]]:
-        row = {'Year': year['year']}
-        for scenario in scenario_names:
-            row[scenario] = next(s['temperature'] for s in scenarios[scenario] if s['year'] == year['year'])
-        comparison.append(row)
-    
-    return comparison
\ No newline at end of file
+import math
+
+import numpy as np
+
+from utils.series import Series
+
+MISSING_MODES = ('null', 'interpolate')
+
+def _column(series):
+    # Year/temperature columns sorted by year; later duplicates of a year win
+    if isinstance(series, Series):
+        series = series.sorted_unique()
+        return series.years, series.values
+    values = {}
+    for entry in series:
+        temperature = entry.get('temperature')
+        values[entry['year']] = float('nan') if temperature is None else float(temperature)
+    # Explicit dtype: an empty scenario would otherwise be float64 and turn every
+    # year in the union into a float
+    years = np.array(sorted(values), dtype=np.int64)
+    return years, np.array([values[year] for year in years.tolist()], dtype=float)
+
+def align_scenarios(scenarios, missing='null'):
+    """
+    Align scenario series on the union of their years.
+    Returns (names, years, matrix) where matrix[i, j] is scenario i in year j.
+    Missing years are NaN, or linearly interpolated between the scenario's
+    neighbouring years when missing='interpolate' (never extrapolated).
+    """
+    if missing not in MISSING_MODES:
+        raise ValueError(f"Unsupported missing-year mode: {missing}")
+    names = list(scenarios)
+    columns = [_column(scenarios[name]) for name in names]
+    if not columns:
+        return names, np.array([]), np.empty((0, 0))
+    years = np.unique(np.concatenate([column_years for column_years, _ in columns]))
+
+    matrix = np.full((len(names), len(years)), np.nan)
+    for row, (column_years, values) in enumerate(columns):
+        if not len(column_years):
+            continue
+        matrix[row, np.searchsorted(years, column_years)] = values
+        if missing == 'interpolate':
+            known = ~np.isnan(values)
+            if known.sum() >= 2:
+                inside = (years >= column_years[known][0]) & (years <= column_years[known][-1])
+                matrix[row, inside] = np.interp(years[inside], column_years[known], values[known])
+    return names, years, matrix
+
+def _clean(value):
+    return None if value is None or (isinstance(value, float) and math.isnan(value)) else value
+
+def _rows(names, years, matrix):
+    return [
+        {'Year': year, **{name: _clean(value) for name, value in zip(names, column)}}
+        for year, column in zip(years.tolist(), matrix.T.tolist())
+    ]
+
+def _stats(values):
+    present = values[~np.isnan(values)]
+    if not len(present):
+        return {'count': 0, 'mean': None, 'min': None, 'max': None, 'start': None, 'end': None, 'change': None}
+    return {
+        'count': int(len(present)),
+        'mean': float(present.mean()),
+        'min': float(present.min()),
+        'max': float(present.max()),
+        'start': float(present[0]),
+        'end': float(present[-1]),
+        'change': float(present[-1] - present[0])
+    }
+
+def compare_scenarios(scenarios, missing='null'):
+    """
+    One row per year with each scenario's temperature ({'Year': ..., name: value}).
+    """
+    names, years, matrix = align_scenarios(scenarios, missing)
+    return _rows(names, years, matrix)
+
+def compare_scenarios_detailed(scenarios, missing='null'):
+    """
+    compare_scenarios rows plus per-scenario summary statistics and statistics of
+    the year-by-year difference for every scenario pair, from one aligned matrix.
+    """
+    names, years, matrix = align_scenarios(scenarios, missing)
+    summary = {name: _stats(row) for name, row in zip(names, matrix)}
+    differences = {}
+    for i, first in enumerate(names):
+        for j in range(i + 1, len(names)):
+            second = names[j]
+            differences[f"{second} - {first}"] = _stats(matrix[j] - matrix[i])
+    return {'rows': _rows(names, years, matrix), 'summary': summary, 'differences': differences}
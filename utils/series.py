@@ -0,0 +1,55 @@
+import numpy as np
+
+class Series:
+    """
+    Columnar annual series: parallel NumPy year and value columns instead of a
+    list of {'year': ..., field: ...} dicts. The pipeline works on Series and only
+    converts to the dict-list JSON shape at the API boundary (to_records).
+    """
+    __slots__ = ('years', 'values', 'field')
+
+    def __init__(self, years, values, field='temperature'):
+        self.years = np.asarray(years, dtype=np.int64)
+        self.values = np.asarray(values, dtype=float)
+        self.field = field
+        if self.years.shape != self.values.shape:
+            raise ValueError("years and values must have the same length")
+
+    @classmethod
+    def from_records(cls, records, field='temperature'):
+        if isinstance(records, Series):
+            return records
+        count = len(records)
+        years = np.fromiter((entry['year'] for entry in records), dtype=np.int64, count=count)
+        values = np.fromiter((entry[field] for entry in records), dtype=float, count=count)
+        return cls(years, values, field)
+
+    def to_records(self):
+        field = self.field
+        return [{'year': year, field: value} for year, value in zip(self.years.tolist(), self.values.tolist())]
+
+    def concat(self, other):
+        return Series(np.concatenate([self.years, other.years]), np.concatenate([self.values, other.values]),
+                      self.field)
+
+    def sorted_unique(self):
+        """
+        Return the series sorted by year, keeping the last value given for a repeated year.
+        """
+        order = np.argsort(self.years, kind='stable')
+        years = self.years[order]
+        values = self.values[order]
+        last = np.append(years[1:] != years[:-1], True) if len(years) else np.array([], dtype=bool)
+        return Series(years[last], values[last], self.field)
+
+    @property
+    def nbytes(self):
+        return self.years.nbytes + self.values.nbytes
+
+    def __len__(self):
+        return len(self.years)
+
+    def __repr__(self):
+        if not len(self):
+            return f"Series(field={self.field!r}, empty)"
+        return f"Series(field={self.field!r}, {len(self)} points, {self.years[0]}-{self.years[-1]})"
@@ -0,0 +1,165 @@
+import os
+import uuid
+
+from flask.sessions import SessionInterface, SessionMixin
+from itsdangerous import BadSignature, Signer
+from werkzeug.datastructures import CallbackDict
+
+from utils.cache import ResultCache
+from utils.metrics import timed
+from utils.sqlite_store import SQLiteStore
+
+DEFAULT_SESSION_TTL = 24 * 60 * 60
+DEFAULT_SESSION_MAX_ENTRIES = 10_000
+
+class MemorySessionStore:
+    """
+    In-process session store; bounded LRU with expiry. Not shared between workers.
+    """
+
+    def __init__(self, max_entries=DEFAULT_SESSION_MAX_ENTRIES, ttl=DEFAULT_SESSION_TTL):
+        self._cache = ResultCache(maxsize=max_entries, ttl=ttl)
+
+    def get(self, sid):
+        return self._cache.get(sid)
+
+    def set(self, sid, data):
+        self._cache.set(sid, data)
+
+    def delete(self, sid):
+        self._cache.delete(sid)
+
+class SQLiteSessionStore:
+    """
+    Session store in a local SQLite file, shared by all workers on the host.
+    """
+
+    def __init__(self, path, max_entries=DEFAULT_SESSION_MAX_ENTRIES, ttl=DEFAULT_SESSION_TTL):
+        self._store = SQLiteStore(path, table='sessions', ttl=ttl, max_entries=max_entries)
+
+    def get(self, sid):
+        return self._store.get(sid)
+
+    def set(self, sid, data):
+        self._store.set(sid, data)
+
+    def delete(self, sid):
+        self._store.delete(sid)
+
+def create_session_store(instance_path):
+    """
+    Build the store selected by SESSION_BACKEND ('memory' or 'sqlite').
+    """
+    backend = os.environ.get('SESSION_BACKEND', 'memory')
+    ttl = float(os.environ.get('SESSION_TTL', DEFAULT_SESSION_TTL))
+    max_entries = int(os.environ.get('SESSION_MAX_ENTRIES', DEFAULT_SESSION_MAX_ENTRIES))
+    if backend == 'memory':
+        return MemorySessionStore(max_entries=max_entries, ttl=ttl)
+    if backend == 'sqlite':
+        path = os.environ.get('SESSION_DB_PATH', os.path.join(instance_path, 'sessions.db'))
+        return SQLiteSessionStore(path, max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Unsupported session backend: {backend}")
+
+def _loads_first(name):
+    method = getattr(CallbackDict, name)
+
+    def wrapper(self, *args, **kwargs):
+        self._load()
+        return method(self, *args, **kwargs)
+    wrapper.__name__ = name
+    return wrapper
+
+class ServerSideSession(CallbackDict, SessionMixin):
+    """
+    Session whose payload is fetched from the store on first access, so requests
+    that never touch `session` (static files, metrics, 304s) skip the read and
+    decode. `loader` returns the stored dict, or None if it has expired, in which
+    case the session starts over under a fresh ID.
+    """
+
+    def __init__(self, initial=None, sid=None, new=False, loader=None):
+        def on_update(self):
+            self.modified = True
+        super().__init__(initial, on_update)
+        self.sid = sid
+        self.new = new
+        self.modified = False
+        self._loader = loader
+        self.loaded = loader is None
+
+    def _load(self):
+        if self.loaded:
+            return
+        self.loaded = True
+        data = self._loader()
+        self._loader = None
+        if data is None:
+            self.sid = uuid.uuid4().hex
+            self.new = True
+        else:
+            # Bypass on_update: filling in stored data is not a modification
+            dict.update(self, data)
+
+# Every read or write of the mapping loads the stored payload first
+for _name in ('__getitem__', '__setitem__', '__delitem__', '__contains__', '__iter__', '__len__', '__repr__',
+              '__eq__', '__ior__', 'get', 'keys', 'values', 'items', 'pop', 'popitem', 'setdefault', 'update',
+              'clear', 'copy'):
+    setattr(ServerSideSession, _name, _loads_first(_name))
+del _name
+
+class ServerSideSessionInterface(SessionInterface):
+    """
+    Flask session interface that keeps session data in a server-side store.
+    The cookie only carries a signed, random session ID.
+    """
+
+    def __init__(self, store):
+        self.store = store
+
+    def _signer(self, app):
+        return Signer(app.secret_key, salt='server-side-session')
+
+    def open_session(self, app, request):
+        cookie = request.cookies.get(self.get_cookie_name(app))
+        if cookie:
+            try:
+                sid = self._signer(app).unsign(cookie).decode('ascii')
+            except BadSignature:
+                sid = None
+            if sid:
+                return ServerSideSession(sid=sid, loader=lambda: self._load(sid))
+        return ServerSideSession(sid=uuid.uuid4().hex, new=True)
+
+    def _load(self, sid):
+        with timed('session_store_load'):
+            return self.store.get(sid)
+
+    def save_session(self, app, session, response):
+        name = self.get_cookie_name(app)
+        domain = self.get_cookie_domain(app)
+        path = self.get_cookie_path(app)
+
+        # Never read during the request (writes load first), so nothing changed
+        if not session.loaded:
+            return
+        if not session:
+            if session.modified and not session.new:
+                self.store.delete(session.sid)
+                response.delete_cookie(name, domain=domain, path=path)
+            return
+
+        if session.modified:
+            with timed('session_store_save'):
+                self.store.set(session.sid, dict(session))
+        if session.new or self.should_set_cookie(app, session):
+            response.set_cookie(
+                name,
+                self._signer(app).sign(session.sid).decode('ascii'),
+                expires=self.get_expiration_time(app, session),
+                httponly=self.get_cookie_httponly(app),
+                domain=domain,
+                path=path,
+                secure=self.get_cookie_secure(app),
+                samesite=self.get_cookie_samesite(app),
+            )
+            response.vary.add('Cookie')
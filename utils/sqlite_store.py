@@ -0,0 +1,133 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+def encode_payload(value):
+    # Compact JSON compressed with zlib; much smaller than indented or plain JSON
+    return zlib.compress(json.dumps(value, separators=(',', ':')).encode('utf-8'))
+
+def decode_payload(blob):
+    return json.loads(zlib.decompress(blob).decode('utf-8'))
+
+class SQLiteStore:
+    """
+    Key/value store in a SQLite file (WAL mode) with per-thread connections,
+    compressed JSON values, a time-to-live and an optional entry cap.
+    The file can be shared by several processes on the same host.
+    """
+
+    # Expired/overflow entries are purged every PURGE_INTERVAL writes
+    PURGE_INTERVAL = 100
+
+    def __init__(self, path, table='entries', ttl=None, max_entries=None):
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+        with self._connection() as connection:
+            connection.execute(
+                f'CREATE TABLE IF NOT EXISTS {table} ('
+                'key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, updated_at REAL NOT NULL)')
+            connection.execute(f'CREATE INDEX IF NOT EXISTS {table}_expires_at ON {table} (expires_at)')
+            connection.execute(f'CREATE INDEX IF NOT EXISTS {table}_updated_at ON {table} (updated_at)')
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        # A connection inherited across fork (e.g. a gunicorn worker forked from a
+        # preloaded master) must not be used by the child; open a fresh one
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
+
+    def get(self, key, default=None):
+        row = self._connection().execute(
+            f'SELECT value, expires_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return default
+        value, expires_at = row
+        if expires_at is not None and expires_at <= time.time():
+            self.delete(key)
+            return default
+        return decode_payload(value)
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        with self._connection() as connection:
+            connection.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)',
+                (key, encode_payload(value), expires_at, now))
+        self._maybe_purge()
+
+    def set_many(self, items):
+        """
+        Write several (key, value) pairs in a single transaction.
+        """
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        rows = [(key, encode_payload(value), expires_at, now) for key, value in items]
+        if not rows:
+            return
+        with self._connection() as connection:
+            connection.executemany(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, expires_at, updated_at) VALUES (?, ?, ?, ?)',
+                rows)
+        self._maybe_purge(len(rows))
+
+    def delete(self, key):
+        with self._connection() as connection:
+            connection.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+
+    def exists(self, key):
+        """
+        Whether an unexpired entry is stored under key, without reading its value.
+        """
+        row = self._connection().execute(
+            f'SELECT 1 FROM {self.table} WHERE key = ? AND (expires_at IS NULL OR expires_at > ?)',
+            (key, time.time())).fetchone()
+        return row is not None
+
+    __contains__ = exists
+
+    def __len__(self):
+        return self._connection().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()[0]
+
+    def _maybe_purge(self, writes=1):
+        with self._lock:
+            before = self._writes
+            self._writes += writes
+            due = self._writes // self.PURGE_INTERVAL != before // self.PURGE_INTERVAL
+        if due:
+            self.purge()
+
+    def purge(self):
+        """
+        Delete expired entries and, if max_entries is set, the least recently written overflow.
+        """
+        with self._connection() as connection:
+            connection.execute(f'DELETE FROM {self.table} WHERE expires_at IS NOT NULL AND expires_at <= ?',
+                               (time.time(),))
+            if self.max_entries:
+                connection.execute(
+                    f'DELETE FROM {self.table} WHERE key IN (SELECT key FROM {self.table} '
+                    'ORDER BY updated_at DESC LIMIT -1 OFFSET ?)', (self.max_entries,))
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
@@ -0,0 +1,24 @@
+import logging
+import os
+import time
+
+from utils.default_bundle import get_default_bundle
+from utils.metrics import REGISTRY
+
+# WARM_UP=0 skips the startup work; the default bundle is then built on the first request
+WARM_UP = os.environ.get('WARM_UP', '1') != '0'
+
+def warm_up(app):
+    """
+    Do the one-off startup work ahead of traffic: build the default bundle (a
+    full pipeline run, which also pages in the numpy code the routes use) and
+    compile every template. Under gunicorn with preload_app this runs once in
+    the master, and the forked workers share the result copy-on-write.
+    """
+    start = time.perf_counter()
+    get_default_bundle()
+    for name in app.jinja_env.list_templates():
+        app.jinja_env.get_template(name)
+    # Warm-up is not traffic; keep it out of the stage histograms every worker inherits
+    REGISTRY.reset()
+    logging.info('Warm-up finished in %.0f ms', (time.perf_counter() - start) * 1000)